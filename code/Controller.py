@@ -1,10 +1,14 @@
 try:
+    import asyncio
+    import concurrent.futures
     import multiprocessing
+    import os
     import redis
     import RobotWorld
     import Terminal
     import time
     import subprocess
+    import threading
 
 except ImportError as e:
     print('--------------------------------------------------------------')
@@ -14,7 +18,54 @@ except ImportError as e:
 # ip of the vrep simulator
 host = '192.168.0.2'
 
+# sensor acquisition mode of the units: 'blocking', 'streaming' or 'summary' (see RobotWorld.World)
+acquisition = 'blocking'
+
+# execution mode:
+# - 'free': each unit runs free against the real-time simulation
+# - 'lockstep': the simulation runs in synchronous mode and advances by one step only after
+#   every unit completed its sense/think/act cycle, or a step of a longer action such as a turn
+#   (deterministic, possibly faster than real time; the motion executor is not used)
+# - 'async': all the units run in this process and share one event loop (see RobotWorld.AsyncWorld)
+# - 'pipelined': like 'free', but in each unit the acquisition of the next frame overlaps the perception
+#   of the current one and the decision (see RobotWorld.Pipeline)
+mode = 'free'
+
+# in lockstep mode, number of steps between two throughput reports
+lockstep_report_interval = 100
+
+# in pipelined mode, number of cycles between two stage latency reports
+pipeline_report_interval = 100
+
+# in async mode, number of threads that perform the remote API calls of all the units
+async_workers = 8
+
+# target color classes of the units (see RobotWorld.perception.ColorTable): edit the json file
+# to add or tune the colors of the belts and stations
+color_classes = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'colors.json')
+
+# blob the units reason about when several are in view: 'largest', 'center' or 'color' (see RobotWorld.World)
+blob_selection = 'largest'
+
+# if true the units render the kinect at low resolution while wandering and at full resolution
+# when a belt is near or centered (see RobotWorld.ResolutionPolicy)
+adaptive_resolution = False
+
+# if true the units map the obstacles they see and avoid the known ones without asking DALI
+# (see RobotWorld.OccupancyGrid)
+mapping = False
+
+# if true the actions of the units run on a control thread: the units keep sensing and thinking
+# while they move, and a new action preempts the running one (see RobotWorld.MotionExecutor)
+motion_executor = False
+
+# interval (s) after which the units send again an unchanged wheel velocity, as a keep-alive
+# (None: unchanged wheel velocities are never sent again, see RobotWorld.World.set_wheels_velocity)
+setpoint_refresh = None
+
 # list of dictionaries containing the names of the handles of the unit's sensors/parts
+# (optionally 'depth_roi': region of the depth buffer in which the unit looks for obstacles, and
+# 'color_band': band of rows of the image in which it looks for the belts, see RobotWorld.World)
 dataList = [
     {
         'sensors': {
@@ -45,13 +96,16 @@ dataList = [
 ]
 
 
-def job(data):
+def job(data, barrier=None):
     """
     function that encapsulates each unit's
     :param data: dictionary containing the data that will be used in the world and brain classes
+    :param barrier: in lockstep mode, barrier shared by all the units; the first unit of dataList
+                    acts as the coordinator and advances the simulation
     :return: nothing
     """
     print(data['port'], 'Starting...')
+    coordinator = barrier is not None and data['port'] == dataList[0]['port']
     try:
         # spawn a terminal for logging
         terminal = Terminal.Terminal(data['port'])
@@ -59,21 +113,132 @@ def job(data):
         time.sleep(1)
         # init the world obj
         world = RobotWorld.World(data['sensors'], data['wheels'], data['signals'], data['plate'],
-                                 data['host'], data['port'], terminal)
+                                 data['host'], data['port'], terminal, acquisition,
+                                 depth_roi=data.get('depth_roi'), color_band=data.get('color_band'),
+                                 color_classes=color_classes, blob_selection=blob_selection,
+                                 resolution_policy=RobotWorld.ResolutionPolicy() if adaptive_resolution else None,
+                                 occupancy_grid=RobotWorld.OccupancyGrid() if mapping else None,
+                                 motion_executor=motion_executor and barrier is None,
+                                 setpoint_refresh=setpoint_refresh)
         # init the brain obj
         brain = RobotWorld.Brain(world, data['port'], terminal)
+        if coordinator:
+            world.set_synchronous(True)
     except Exception as e:
         print(data['port'], 'Exception: ', e)
+        if barrier is not None:
+            # release the other units
+            barrier.abort()
         exit(1)
 
+    if mode == 'pipelined':
+        RobotWorld.Pipeline(world, brain, terminal, pipeline_report_interval).run()
+        return
+
+    steps = 0
+    start = time.time()
+
+    def advance():
+        """
+        lockstep: waits for every unit to complete its step, advances the simulation by one step
+        and waits for the step to be computed
+        """
+        nonlocal steps
+        # wait for every unit to complete the step
+        barrier.wait()
+        if coordinator:
+            world.step()
+            steps += 1
+            if steps % lockstep_report_interval == 0:
+                elapsed = time.time() - start
+                terminal.write('lockstep: {} steps in {:.1f}s ({:.1f} steps/s), {} unchanged frames skipped, '
+                               '{} unchanged wheel setpoints suppressed'
+                               .format(steps, elapsed, steps / elapsed, world.frame_hits,
+                                       world.suppressed_commands))
+        # wait for the step to be computed before sensing again
+        barrier.wait()
+
+    if barrier is not None:
+        # the turns advance the simulation too, one step per control tick
+        world.lockstep = advance
+
+    try:
+        # cycle
+        while True:
+            # sense the environment
+            environment = world.sense()
+            if environment['fresh']:
+                # compute an action
+                action = brain.think(environment)
+                # do that action
+                world.act(action)
+            elif barrier is None:
+                # no new frame yet (streaming acquisition): wait for it instead of thinking again on the same one
+                time.sleep(RobotWorld.pipeline.ACQUISITION_IDLE)
+
+            if barrier is not None:
+                advance()
+    except threading.BrokenBarrierError:
+        print(data['port'], 'another unit stopped, stopping')
+    finally:
+        if barrier is not None:
+            # release the other units if this one stops (e.g. on a sensor error)
+            barrier.abort()
+
+
+async def async_job(data, executor):
+    """
+    asynchronous version of job: the units share the event loop and the executor
+    :param data: dictionary containing the data that will be used in the world and brain classes
+    :param executor: executor that runs the remote API calls of all the units
+    :return: nothing
+    """
+    print(data['port'], 'Starting...')
+    loop = asyncio.get_running_loop()
+
+    def init():
+        # spawn a terminal for logging
+        terminal = Terminal.Terminal(data['port'])
+        # wait for the terminal to spawn
+        time.sleep(1)
+        world = RobotWorld.World(data['sensors'], data['wheels'], data['signals'], data['plate'],
+                                 data['host'], data['port'], terminal, acquisition,
+                                 depth_roi=data.get('depth_roi'), color_band=data.get('color_band'),
+                                 color_classes=color_classes, blob_selection=blob_selection,
+                                 resolution_policy=RobotWorld.ResolutionPolicy() if adaptive_resolution else None,
+                                 occupancy_grid=RobotWorld.OccupancyGrid() if mapping else None,
+                                 motion_executor=motion_executor, setpoint_refresh=setpoint_refresh)
+        brain = RobotWorld.Brain(world, data['port'], terminal)
+        return world, brain
+
+    try:
+        world, brain = await loop.run_in_executor(None, init)
+    except Exception as e:
+        print(data['port'], 'Exception: ', e)
+        return
+    world = RobotWorld.AsyncWorld(world, executor)
+
     # cycle
     while True:
         # sense the environment
-        environment = world.sense()
-        # compute an action
-        action = brain.think(environment)
+        environment = await world.sense()
+        if not environment['fresh']:
+            # no new frame yet (streaming acquisition): wait for it instead of thinking again on the same one
+            await asyncio.sleep(RobotWorld.pipeline.ACQUISITION_IDLE)
+            continue
+        # compute an action (the brain waits for DALI: it does not use the remote API executor)
+        action = await loop.run_in_executor(None, brain.think, environment)
         # do that action
-        world.act(action)
+        await world.act(action)
+
+
+async def async_main():
+    """
+    runs all the declared units on the current event loop
+    :return: none
+    """
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=async_workers)
+    await asyncio.gather(*[async_job(data, executor) for data in dataList])
 
 
 def main():
@@ -81,6 +246,20 @@ def main():
     main: spawns a process for each declared unit
     :return: none
     """
+    if mode == 'lockstep':
+        # the barrier must be inherited by the processes, so they cannot be pooled
+        barrier = multiprocessing.Barrier(len(dataList))
+        processes = [multiprocessing.Process(target=job, args=(data, barrier)) for data in dataList]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        return
+
+    if mode == 'async':
+        asyncio.run(async_main())
+        return
+
     pool = multiprocessing.Pool(processes=len(dataList))  # start processes
     pool.map(job, dataList)  # we map each process to the input.
     pool.close()
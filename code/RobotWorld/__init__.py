@@ -1,20 +1,52 @@
+import contextlib
 import math
-import struct
+import os
 import time
+import threading
 import numpy as np
 import redis
 
-try:
-    import vrep
+from .asyncworld import AsyncWorld
+from .pipeline import Pipeline
+from .occupancy import Odometry, OccupancyGrid
+from .motion import MotionExecutor, MotionHandle
+from .actions import Action, parse_action, GO, LEFT, RIGHT, STOP, LOADUP, UNLOAD
+from .perception import DEFAULT_DEPTH_ROI, DEFAULT_COLOR_BAND, MIN_COLOR_FRACTION, ColorTable, DEPTH_SECTORS, \
+    depth_profile, free_direction, frame_signature, classify_colors, parse_blobs, blob_colors, select_blob, \
+    ResolutionPolicy
 
-except ImportError as e:
-    print('--------------------------------------------------------------')
-    print('"vrep.py" could not be imported. This means very probably that')
-    print('either "vrep.py" or the remoteApi library could not be found.')
-    print('Make sure both are in the same folder as this file,')
-    print('or appropriately adjust the file "vrep.py"')
-    print('--------------------------------------------------------------')
-    print(e)
+
+# the connections left open are closed only by the first World of the process:
+# the other worlds of the same process (e.g. AsyncWorld units) share the remote API client
+_connections_reset = False
+_connections_lock = threading.Lock()
+
+
+def load_backend(name=None):
+    """
+    imports the remote API backend
+    :param name: 'vrep' (the V-REP remote API, default) or 'fake' (the pure python loopback
+                 backend, see vrepFake); if None it is read from the ROBOTWORLD_BACKEND
+                 environment variable
+    :return: the backend module
+    """
+    name = name or os.environ.get('ROBOTWORLD_BACKEND', 'vrep')
+    if name == 'fake':
+        import vrepFake
+        return vrepFake
+
+    try:
+        import vrep
+    except ImportError as e:
+        print('--------------------------------------------------------------')
+        print('"vrep.py" could not be imported. This means very probably that')
+        print('either "vrep.py" or the remoteApi library could not be found.')
+        print('Make sure both are in the same folder as this file,')
+        print('or appropriately adjust the file "vrep.py"')
+        print('--------------------------------------------------------------')
+        print(e)
+        raise
+    return vrep
 
 
 class World(object):
@@ -22,7 +54,10 @@ class World(object):
     Robot simulator class to communicate with the simulation environment.
     """
 
-    def __init__(self, sensors, wheels, signals, plate, host='127.0.0.1', port=19999, terminal=None):
+    def __init__(self, sensors, wheels, signals, plate, host='127.0.0.1', port=19999, terminal=None,
+                 acquisition='blocking', backend=None, depth_roi=None, color_band=None, color_classes=None,
+                 blob_selection='largest', target_color=None, change_detection=True, resolution_policy=None,
+                 occupancy_grid=None, control_hz=50, motion_executor=False, setpoint_refresh=None):
         """
         initialize the connection to vrep and retrieves the handler
         :param sensors: list of the names of the sensor devices
@@ -32,9 +67,52 @@ class World(object):
         :param host: ip of the vrep simulator
         :param port: port of the vrep simulator
         :param terminal: terminal object that will be used for logging
+        :param acquisition: sensor acquisition mode: 'blocking' (one round trip per sensor read),
+                            'streaming' (reads are streamed by vrep and sense() never blocks
+                            after the first frame) or 'summary' (the scene computes the perception
+                            summary and sends only a few values, see scene/perception_summary_script.lua)
+        :param backend: remote API backend, see load_backend
+        :param depth_roi: region of the depth buffer in which obstacles are looked for, as fractions
+                          of the frame (first column, last column, first row, last row);
+                          by default the central vertical slice
+        :param color_band: band of rows of the image in which the belt colors are looked for, as
+                           fractions of the frame height (first row, last row); by default the
+                           rows around the middle of the image
+        :param color_classes: target color classes (list of {'name', 'rgb', 'tolerance'} dictionaries
+                              or path of a json file), see perception.ColorTable; by default the red
+                              and green belts
+        :param blob_selection: blob the unit reasons about when several are in view: 'largest',
+                               'center' (nearest to the center of the image) or 'color' (the largest
+                               blob of the target color), see perception.select_blob; in summary
+                               acquisition the scene sends only the first blob, which is always selected
+        :param target_color: target color of the 'color' blob selection, by default any color class
+        :param change_detection: if true, the frames are processed only if they differ from the previous
+                                 ones (see perception.frame_signature), otherwise the previous
+                                 perception is reused
+        :param resolution_policy: callable that chooses the resolution of the kinect from the perception
+                                  of each new frame (e.g. ResolutionPolicy); by default the resolution of
+                                  the scene is kept
+        :param occupancy_grid: OccupancyGrid in which the unit maps the obstacles it sees, using the
+                               depth profile and a dead-reckoning pose; by default nothing is mapped
+        :param control_hz: frequency of the turn control loop
+        :param motion_executor: if true, the actions are performed on a control thread and act()
+                                returns immediately (see MotionExecutor)
+        :param setpoint_refresh: interval (s) after which an unchanged wheel velocity is sent again, as a
+                                 keep-alive; by default unchanged velocities are never sent again
         """
         # turtning speed
         self._turning_speed = 1.5
+        # held while a command batch is being built: the control, sensing and pipeline threads all send
+        # commands, and unpausing the communication would flush the batch of another thread
+        self._command_lock = threading.RLock()
+        # last velocity sent to each wheel joint and when (perf_counter seconds): unchanged velocities
+        # are not sent again, unless they are older than the refresh interval
+        self._setpoints = {}
+        self._setpoint_refresh = setpoint_refresh
+        self.suppressed_commands = 0
+        # frequency (Hz) at which the turns read the gyroscope, and maximum duration of a turn (s)
+        self._control_hz = control_hz
+        self._turn_timeout = 30.0
         self._host = host
         self._port = port
         self._term = terminal
@@ -42,82 +120,233 @@ class World(object):
         self._load = "EMPTY"
         # handle of the carried cube object
         self._cube_handle = None
+        # region of interest of the depth features
+        self._depth_roi = depth_roi or DEFAULT_DEPTH_ROI
+        # band of rows of the color features
+        self._color_band = color_band or DEFAULT_COLOR_BAND
+        # lookup table of the target color classes
+        self._color_table = ColorTable(color_classes)
+        # blob selection strategy
+        self._blob_selection = blob_selection
+        self._target_color = target_color
+        # sensor acquisition mode
+        self._acquisition = acquisition
+        # true once the streamed sensor reads have been registered on the server
+        self._streaming = False
+        # vrep timestamp of the last sensed frame and the corresponding sense() output
+        self._last_timestamp = None
+        self._last_sensed = None
+        # resolution of the kinect, None until it is set
+        self._resolution_policy = resolution_policy
+        self._resolution = None
+        # map of the obstacles and pose of the unit
+        self.occupancy_grid = occupancy_grid
+        self.odometry = Odometry() if occupancy_grid is not None else None
+        # last frame read by acquire
+        self._last_frame = None
+        # true once the gyroscope signal is streamed
+        self._gyro_streaming = False
+        # signature of the last processed frames, and number of frames whose perception has been
+        # reused because they were equal to the previous ones (hits) or computed (misses)
+        self._change_detection = change_detection
+        self._last_signature = None
+        self.frame_hits = 0
+        self.frame_misses = 0
+
+        # remote API backend
+        self._vrep = load_backend(backend)
 
         # just in case, close all opened connections
-        vrep.simxFinish(-1)
+        global _connections_reset
+        with _connections_lock:
+            if not _connections_reset:
+                self._vrep.simxFinish(-1)
+                _connections_reset = True
         # enstablish the connection
-        self._clientID = vrep.simxStart(self._host, self._port, True, True, 5000, 5)
+        self._clientID = self._vrep.simxStart(self._host, self._port, True, True, 5000, 5)
         # connection error
         if self._clientID == -1:
             terminal.write('Connection to the server was not possible')
             exit(1)
         # default operation mode
-        self._operation_mode = vrep.simx_opmode_blocking
+        self._operation_mode = self._vrep.simx_opmode_blocking
 
-        self.wheels_handles = {}
-        self.sensors_handles = {}
         self.signals = signals
 
-        # fetch wheel handles
-        self._term.write('Fetching wheels handles...')
-        for w in wheels:
-            res, handle = vrep.simxGetObjectHandle(self._clientID, wheels[w], self._operation_mode)
-            if res == vrep.simx_return_ok:
-                self.wheels_handles[w] = handle
-            else:
-                self._term.write('Wheels handle error: {}'.format(res))
-                exit(1)
-
-        # fetch sensors handles
-        self._term.write('Fetching sensors handles...')
-        for s in sensors:  # initialize the robot.
-            res, handle = vrep.simxGetObjectHandle(self._clientID, sensors[s], self._operation_mode)
-            if res == vrep.simx_return_ok:
-                self.sensors_handles[s] = handle
-            else:
-                self._term.write('Sensors handle error: {}'.format(res))
-                exit(1)
-
-        # fetch plate handle
-        res, handle = vrep.simxGetObjectHandle(self._clientID, plate, self._operation_mode)
-        if res == vrep.simx_return_ok:
-            self.plate_handle = handle
-        else:
-            self._term.write('Plate handle error: {}'.format(res))
+        # resolve all the handles at once
+        self._term.write('Fetching handles...')
+        names = list(wheels.values()) + list(sensors.values()) + [plate]
+        handles = self._fetch_handles()
+        missing = [name for name in names if name not in handles]
+        if missing:
+            self._term.write('Handle error: objects not found: {}'.format(missing))
             exit(1)
 
+        self.wheels_handles = {w: handles[wheels[w]] for w in wheels}
+        self.sensors_handles = {s: handles[sensors[s]] for s in sensors}
+        self.plate_handle = handles[plate]
+
         self._term.write("successfully fetched all handles")
 
+        # elementary actions of each kind of action: (value, cancel event) -> result
+        self._dispatch = {
+            GO: lambda value, cancel: self.go(value),
+            LEFT: lambda value, cancel: self.turn(self._turning_speed, 0, value, cancel=cancel),
+            RIGHT: lambda value, cancel: self.turn(0, self._turning_speed, value, cancel=cancel),
+            STOP: lambda value, cancel: self.stop(),
+            LOADUP: lambda value, cancel: self.loadup(),
+            UNLOAD: lambda value, cancel: self.unload(),
+        }
+
+        # control thread of the actions
+        self.motion = MotionExecutor(self) if motion_executor else None
+        # in lockstep mode, function that advances the simulation by one step together with the other
+        # units and waits for the step to be computed: the actions that last several steps (the turns)
+        # call it instead of waiting for the simulation to advance (see Controller.job)
+        self.lockstep = None
+
+        if self.occupancy_grid is not None:
+            # geometry of the depth sensor, to turn the depth buffer into distances
+            depth_handle = self.sensors_handles['kinect_depth']
+            self._clipping = [self._vrep.simxGetObjectFloatParameter(self._clientID, depth_handle, parameter,
+                                                                     self._operation_mode)[1]
+                              for parameter in (self._vrep.sim_visionfloatparam_near_clipping,
+                                                self._vrep.sim_visionfloatparam_far_clipping)]
+            self._view_angle = self._vrep.simxGetObjectFloatParameter(self._clientID, depth_handle,
+                                                                      self._vrep.sim_visionfloatparam_perspective_angle,
+                                                                      self._operation_mode)[1]
+
+    def _fetch_handles(self):
+        """
+        resolves object names into handles: the name -> handle map of the whole scene is retrieved
+        with a single query, instead of one round trip per object
+        :return: dictionary name -> handle of the whole scene
+        """
+        # data type 0: object names
+        res, handles, int_data, float_data, object_names = self._vrep.simxGetObjectGroupData(self._clientID,
+                                                                                       self._vrep.sim_appobj_object_type,
+                                                                                       0,
+                                                                                       self._operation_mode)
+        if res != self._vrep.simx_return_ok:
+            self._term.write('Handles error: {}'.format(res))
+            exit(1)
+        return dict(zip(object_names, handles))
+
     def sense(self):
         """
         Sense the world and return data
-        :return: constructed dictionary of the form {DEPTH, {BLOB_COLOR, BLOB_POSITION}, BLOB_SIZE}
-        """
+        :return: constructed dictionary of the form {DEPTH, {BLOB_COLOR, BLOB_POSITION}, BLOB_SIZE},
+                 along with the vrep timestamp of the frame, whether the frame is fresh
+                 (false if it is the same frame returned by the previous call) and whether it
+                 changed from the previous frame
+        """
+        return self.perceive(self.acquire())
+
+    def acquire(self, copy=False):
+        """
+        reads the sensors (first stage of sense)
+        :param copy: if true the frames are copied out of the remote API buffers, as required when
+                     they are processed while the next frame is read (see Pipeline)
+        :return: frame: dictionary with the vrep 'timestamp' and the 'depth' buffer, 'image' and
+                 'blob_data' of the kinect (or its 'summary', in summary acquisition)
+        """
+        summary = None
+        depth = image = blob_data = None
+        if self._acquisition == 'summary':
+            # the scene summarizes the frame: a few bytes per cycle instead of the depth buffer and image
+            result, summary = self._read_summary()
+        elif self._acquisition == 'streaming' and self._streaming:
+            # read the latest frame streamed by vrep, without waiting for the server
+            result, resolution, depth, image, blob_data = self._read_sensors(self._vrep.simx_opmode_buffer)
+        else:
+            # first frame (or blocking acquisition): wait for the server
+            result, resolution, depth, image, blob_data = self._read_sensors(self._operation_mode, copy)
+            if self._acquisition == 'streaming':
+                # from now on let vrep stream the sensor data
+                self._read_sensors(self._vrep.simx_opmode_streaming)
+                self._streaming = True
+
+        if result & self._vrep.simx_return_novalue_flag and self._last_frame is not None:
+            # nothing streamed yet: the last frame is still the most recent one
+            return self._last_frame
+        if result != self._vrep.simx_return_ok:  # checking the reading result.
+            exit(result)
 
-        out = {}
+        self._last_frame = {'timestamp': self._vrep.simxGetLastCmdTime(self._clientID), 'depth': depth,
+                            'image': image, 'blob_data': blob_data, 'summary': summary,
+                            'gyro': self._read_gyro_rate() if self.odometry is not None else None}
+        return self._last_frame
+
+    def perceive(self, frame):
+        """
+        extracts the features of a frame (second stage of sense)
+        :param frame: frame returned by acquire
+        :return: see sense
+        """
+        timestamp = frame['timestamp']
+        depth, image, blob_data, summary = frame['depth'], frame['image'], frame['blob_data'], frame['summary']
+
+        same_frame = timestamp == self._last_timestamp and self._last_sensed is not None
+        signature = None
+        if self._change_detection and summary is None and not same_frame:
+            signature = frame_signature((depth, image))
+
+        if same_frame:
+            # same frame as before: do not process it again
+            out = self._last_sensed.copy()
+            out['fresh'] = False
+        elif signature is not None and signature == self._last_signature:
+            # new frame, but equal to the previous one (e.g. the unit is waiting for DALI): reuse its perception
+            self.frame_hits += 1
+            out = self._last_sensed.copy()
+            out['timestamp'] = timestamp
+            out['fresh'] = True
+            out['changed'] = False
+            self._last_timestamp = timestamp
+            self._last_sensed = out
+        else:
+            self.frame_misses += 1
+            out = {}
 
-        # retrieve depth data
-        result, resolution, data = vrep.simxGetVisionSensorDepthBuffer(self._clientID,
-                                                                       self.sensors_handles['kinect_depth'],
-                                                                       self._operation_mode)
-        if result != vrep.simx_return_ok:  # checking the reading result.
-            exit(result)
+            if summary is not None:
+                depth, location, profile, out['colors'], blob_data = summary
+                out['depth'], out['depth_location'], out['depth_profile'] = self.clean_depth(depth, location, profile)
+            else:
+                # get clean depth data
+                out['depth'], out['depth_location'], out['depth_profile'] = self.get_depth(depth)
 
-        # get clean depth data
-        out['depth'] = self.get_depth(data)  # appending the distance depth.
+                # classify the colors of the image
+                out['colors'] = classify_colors(image, self._color_band, self._color_table)
 
-        # retrieve vision sensor image
-        result_vision, resolution, image = vrep.simxGetVisionSensorImage(self._clientID,
-                                                                         self.sensors_handles['kinect_rgb'],
-                                                                         0,
-                                                                         vrep.simx_opmode_blocking)
-        # retrieve vision sensor filtered image (blob)
-        result_blob, t0, t1 = vrep.simxReadVisionSensor(self._clientID,
-                                                        self.sensors_handles['kinect_rgb'],
-                                                        vrep.simx_opmode_blocking)
+            # side toward which an obstacle can be avoided
+            out['free_direction'] = free_direction(out['depth_profile'])
 
-        # extract blob data
-        out['vision'] = self.get_vision(resolution, image, t1)
+            # extract blob data
+            out['blobs'] = parse_blobs(blob_data[1])
+            if summary is not None:
+                # the image is not available: the blob takes the color of the band
+                out['blob_colors'] = [self.get_blob_color(out['colors'])] * len(out['blobs'])
+            else:
+                out['blob_colors'] = blob_colors(out['blobs'], image, self._color_table)
+            # index of the blob the unit reasons about
+            out['blob'] = select_blob(out['blobs'], self._blob_selection, out['blob_colors'], self._target_color)
+            out['vision'] = self.get_vision(out['colors'], out['blobs'], out['blob_colors'], out['blob'])
+
+            out['timestamp'] = timestamp
+            out['fresh'] = True
+            out['changed'] = True
+            self._last_timestamp = timestamp
+            self._last_signature = signature
+            self._last_sensed = out
+
+        if out['fresh'] and self.occupancy_grid is not None:
+            # map what the unit sees from where it is
+            self.update_map(timestamp, frame['gyro'], out['depth_profile'])
+            out['pose'] = self.odometry.pose
+
+        if out['fresh'] and self._resolution_policy is not None:
+            # adapt the resolution of the next frames
+            self.set_resolution(self._resolution_policy(out))
 
         # get load status
         out['load'] = self._load
@@ -126,152 +355,260 @@ class World(object):
 
         return out
 
-    @staticmethod
-    def get_depth(matrix):
+    def _read_sensors(self, operation_mode, copy=False):
+        """
+        reads the kinect depth buffer, rgb image and blob data
+        :param operation_mode: vrep operation mode used for the reads
+        :param copy: if true the frames are copied out of the remote API buffers
+        :return: result (simx_return_ok only if all the reads succeeded), image resolution,
+                 depth buffer, image and blob data
+        """
+        # in streaming mode the remote API buffers are refreshed by the communication thread:
+        # take a copy so that the frame does not change while it is processed
+        copy = copy or operation_mode == self._vrep.simx_opmode_buffer
+
+        # retrieve depth data (as a (h, w) float32 view over the remote API buffer)
+        result_depth, resolution, depth = self._vrep.simxGetVisionSensorDepthBufferArray(self._clientID,
+                                                                                   self.sensors_handles['kinect_depth'],
+                                                                                   operation_mode,
+                                                                                   copy)
+        # retrieve vision sensor image (as a (h, w, 3) view over the remote API buffer)
+        result_vision, resolution, image = self._vrep.simxGetVisionSensorImageArray(self._clientID,
+                                                                              self.sensors_handles['kinect_rgb'],
+                                                                              0,
+                                                                              operation_mode,
+                                                                              copy)
+        # retrieve vision sensor filtered image (blob)
+        result_blob, detection, blob_data = self._vrep.simxReadVisionSensor(self._clientID,
+                                                                      self.sensors_handles['kinect_rgb'],
+                                                                      operation_mode)
+
+        return result_depth | result_vision | result_blob, resolution, depth, image, blob_data
+
+    def _read_gyro_rate(self, blocking=False):
+        """
+        reads the angular rate around the z axis streamed by the gyroscope, without waiting for the server
+        :param blocking: if true, wait for the server instead (the reading of the current step)
+        :return: angular rate (rad/s), None if it is not available yet
+        """
+        if blocking:
+            mode = self._operation_mode
+        else:
+            mode = self._vrep.simx_opmode_buffer if self._gyro_streaming else self._vrep.simx_opmode_streaming
+            self._gyro_streaming = True
+        result, data = self._vrep.simxGetStringSignal(self._clientID, self.signals['gyro_signal'], mode)
+        if result != self._vrep.simx_return_ok or len(data) < 12:
+            return None
+        return float(self._vrep.simxUnpackFloatsArray(data)[2])
+
+    def update_map(self, timestamp, gyro_rate, profile):
+        """
+        advances the pose of the unit and integrates a depth profile into the occupancy grid
+        :param timestamp: vrep timestamp of the frame (ms)
+        :param gyro_rate: angular rate around the z axis (rad/s), None if not available
+        :param profile: normalized minimum depth of each vertical sector, left to right
+        """
+        self.odometry.advance(timestamp / 1000.0, gyro_rate)
+        near, far = self._clipping
+        sectors = len(profile)
+        # direction of the center of each sector, the leftmost sector looks counterclockwise
+        angles = (0.5 - (np.arange(sectors) + 0.5) / sectors) * self._view_angle
+        depth = np.asarray(profile)
+        # the depth buffer measures the distance from the image plane, not along the ray
+        distances = (near + depth * (far - near)) / np.cos(angles)
+        self.occupancy_grid.update(self.odometry.pose, angles, distances, depth < 0.99)
+
+    def known_obstacle(self, angle, distance):
+        """
+        tells whether the occupancy grid knows of an obstacle in a direction
+        :param angle: direction relative to the heading of the unit (rad, counterclockwise)
+        :param distance: distance within which obstacles are looked for (m)
+        :return: true if there is a known obstacle, false otherwise or if the unit does not map
+        """
+        if self.occupancy_grid is None:
+            return False
+        return self.occupancy_grid.blocked(self.odometry.pose, angle, distance)
+
+    def _read_summary(self):
+        """
+        calls the perceptionSummary function of the scene's main script, which computes the depth
+        and color features in the simulator
+        :return: result and summary: minimum depth, its (row, column) location, depth profile,
+                 colors (see classify_colors, only the color that covers most of the band) and blob data
+                 (only the first blob, in the layout of the vision sensor packets); the summary is None
+                 if the call failed
+        """
+        # the handles of the kinect, the number of sectors of the depth profile,
+        # then red, green, blue and tolerance of each target color class
+        in_ints = [self.sensors_handles['kinect_depth'], self.sensors_handles['kinect_rgb'], DEPTH_SECTORS]
+        for color_class in self._color_table.classes:
+            in_ints += [int(v) for v in color_class['rgb']] + [int(color_class['tolerance'])]
+        # the depth region of interest and the color band
+        in_floats = list(self._depth_roi) + list(self._color_band)
+
+        result, out_int, out_float, out_string, out_buffer = \
+            self._vrep.simxCallScriptFunction(self._clientID,
+                                        "",
+                                        self._vrep.sim_scripttype_mainscript,
+                                        "perceptionSummary",
+                                        in_ints,
+                                        in_floats,
+                                        [],
+                                        bytearray(),
+                                        self._operation_mode)
+        if result != self._vrep.simx_return_ok:
+            return result, None
+
+        color, blob_count, depth_row, depth_column = out_int
+        depth, fraction, color_x, color_y, blob_size, blob_x, blob_y = out_float[:7]
+        profile = np.array(out_float[7:7 + DEPTH_SECTORS])
+        colors = {}
+        if color > 0:
+            colors[self._color_table.names[color]] = (fraction, (color_x, color_y))
+        # the scene sends only the first of the blob_count blobs it sees
+        blob_data = [[], [min(blob_count, 1), 6, blob_size, 0.0, blob_x, blob_y, 0.0, 0.0]]
+        return result, (depth, (depth_row, depth_column), profile, colors, blob_data)
+
+    def get_depth(self, matrix):
         """
         extract the depth value from the depth buffer
-        :param matrix: image depth buffer
-        :return: depth value rounded up to the 5th digit
-        """
-        # 640*480 resolution
-        depth = 100
-        # look only at the central vertical slice
-        for i in range(210, 430):
-            for j in range(480):
-                if matrix[i*220+j] < depth:
-                    depth = matrix[i*220+j]  # update matrix.
-        return round(depth, 5)
-
-    def get_vision(self, resolution, image, blob_data):
-        """
-        extract blob data from vision sensor image buffer
-
-
-        blob_data[0]=blob count
-        blob_data[1]=n=value count per blob
-        blob_data[2]=blob 1 size
-        blob_data[3]=blob 1 orientation
-        blob_data[4]=blob 1 position x
-        blob_data[5]=blob 1 position y
-        blob_data[6]=blob 1 width
-        blob_data[7]=blob 1 height
-        ...
+        :param matrix: depth buffer of shape (resolution y, resolution x)
+        :return: depth value rounded up to the 5th digit (the minimum within the region of interest),
+                 its (row, column) pixel location and the minimum depth of each vertical sector of the frame
+        """
+        return self.clean_depth(*depth_profile(matrix, self._depth_roi))
+
+    @staticmethod
+    def clean_depth(depth, location, profile):
+        """
+        :param depth: minimum depth within the region of interest
+        :param location: its (row, column) pixel location
+        :param profile: minimum depth of each vertical sector
+        :return: depth, location and profile, with the depths rounded up to the 5th digit
+        """
+        return round(min(100, depth), 5), location, [round(min(100, float(d)), 5) for d in profile]
+
+    def get_vision(self, colors, blobs, colors_of_blobs, selected):
+        """
+        describes the selected blob of the vision sensor
+        :param colors: colors of the image, see classify_colors
+        :param blobs: structured array of the blobs, see parse_blobs
+        :param colors_of_blobs: color of each blob, see blob_colors
+        :param selected: index of the selected blob, None if no blob is selected
         :return: {COLOR, POSITION}, SIZE
         """
         color = "NONE"
         position = "NONE"
 
-        blob_data = blob_data[1]
-
-        if blob_data[0] == 0:
+        if selected is None:
             return color, position
 
-        blob_size = blob_data[2]
+        blob = blobs[selected]
+        blob_size = float(blob['size'])
+        blob_x = float(blob['x'])
 
         # get color
-        color = self.get_blob_color(resolution, image)
+        color = colors_of_blobs[selected]
+        if color == "NONE":
+            # the bounding box of the blob is not of any color class: use the colors of the band
+            color = self.get_blob_color(colors)
         if color == "NONE":
             return color, position, round(blob_size, 5)
 
         if blob_size >= 0.65:
             return color, "NEAR", round(blob_size, 5)
 
-        if 0.35 < blob_data[4] < 0.65:
+        if 0.35 < blob_x < 0.65:
             return color, "CENTER", round(blob_size, 5)
 
-        if 0.0 < blob_data[4] < 0.35:
+        if 0.0 < blob_x < 0.35:
             return color, "LEFT", round(blob_size, 5)
 
-        if 0.65 < blob_data[4] < 1:
+        if 0.65 < blob_x < 1:
             return color, "RIGHT", round(blob_size, 5)
 
         return color, position, round(blob_size, 5)
 
     @staticmethod
-    def get_blob_color(resolution, image):
+    def get_blob_color(colors):
         """
-        extract the blob color from an imagebuffer
-        :param resolution: resolution of the image
-        :param image: image buffer
-        :return: blob color
+        extract the blob color from the colors of an image
+        :param colors: dictionary color -> (pixel fraction, centroid), see classify_colors
+        :return: blob color: the color that covers most of the band, if it covers enough of it
         """
-
-        image = np.array(image, dtype=np.uint8)
-        detected_color = "NONE"
-        colors = 3
-        # the len of the image is 921600 = 640x480x3 => this means that each 3 values is a pixel
-        # red = 200,41,41
-        # green = 72,233,72
-
-        for x in range(resolution[0]-3):
-            y = int(resolution[1]/2)  # I only look at the line of pixels in the middle
-            r = image[colors * (y * resolution[0] + x)]
-            g = image[colors * (y * resolution[0] + x) + 1]
-            b = image[colors * (y * resolution[0] + x) + 2]
-            if r == 0 or g == 0 or b == 0:  # if black
-                continue
-
-            if g > 190:  # we detect green.
-                detected_color = "GREEN"
-
-            elif r > 190:  # we detect red.
-                detected_color = "RED"
-
-        return detected_color
+        detected = [(fraction, color) for color, (fraction, centroid) in colors.items()
+                    if fraction >= MIN_COLOR_FRACTION]
+        if not detected:
+            return "NONE"
+        return max(detected)[1]
 
     def stop(self):
         """
-        Stops the unit and re-centers the carried cube, if any
+        Stops the unit (the carried cube, if any, is attached to the plate and stays in place)
         """
         self._term.write('stopped')
-        # the second parameter is the velocity.
-        vrep.simxSetJointTargetVelocity(self._clientID, self.wheels_handles["wheel_right"], 0, self._operation_mode)
-        vrep.simxSetJointTargetVelocity(self._clientID, self.wheels_handles["wheel_left"], 0, self._operation_mode)
-        # move back the package to the center of the platform
-        if self._cube_handle is not None:
-
-            return_code, plate_position = vrep.simxGetObjectPosition(self._clientID, self.plate_handle, -1,
-                                                                     self._operation_mode)
+        self.set_wheels_velocity(0, 0)
 
-            final_position = plate_position
-            final_position[2] += 0.05
-
-            vrep.simxSetObjectPosition(self._clientID, self._cube_handle, -1, final_position, self._operation_mode)
-            time.sleep(0.1)
-
-    def turn(self, speedr, speedl, angle):
+    def turn(self, speedr, speedl, angle, timeout=None, cancel=None):
         """
-        turns the unit: giving speed to the left wheel makes the robot to turn right and vice-versa
+        turns the unit: giving speed to the left wheel makes the robot to turn right and vice-versa.
+        The angular rate streamed by the gyroscope is integrated over the simulation time between two
+        readings, at the control frequency, and the unit stops as soon as the angle is reached.
+        In lockstep mode (see lockstep) the turn advances the simulation by one step per tick and
+        is timed on the simulation clock
         :param speedr: speed of the right wheel.
         :param speedl: speed of the left wheel.
-        :param angle: turning angle.
+        :param angle: turning angle (degrees).
+        :param timeout: maximum duration of the turn (s), by default the turn timeout of the unit
+        :param cancel: threading.Event that interrupts the turn when set
+        :return: achieved angle (degrees) and duration of the turn (s)
         """
         self._term.write('turning, angle = {}'.format(angle))
+        timeout = self._turn_timeout if timeout is None else timeout
+        period = 1.0 / self._control_hz
+        lockstep = self.lockstep
+        if lockstep is not None:
+            # the simulation only advances with the steps
+            clock = lambda: self._vrep.simxGetLastCmdTime(self._clientID) / 1000.0
+        else:
+            clock = time.perf_counter
+        self.set_wheels_velocity(speedr, speedl)
+
         # will contain cumulative turtning angle
-        z = 0
+        z = 0.0
+        start = clock()
+        # deadline of the next control tick: the ticks do not drift with the time spent in each one
+        next_tick = time.perf_counter()
+        # simulation time (ms) of the last gyroscope reading (in lockstep the unit turns from the next step)
+        last_reading = self._vrep.simxGetLastCmdTime(self._clientID) if lockstep is not None else None
         while z < angle:
-            time.sleep(1)
-            # the second parameter is the velocity
-            # set speed
-            vrep.simxSetJointTargetVelocity(self._clientID, self.wheels_handles["wheel_right"], speedr,
-                                            self._operation_mode)
-            vrep.simxSetJointTargetVelocity(self._clientID, self.wheels_handles["wheel_left"], speedl,
-                                            self._operation_mode)
-            # get gyroscope data
-            gyro_data = vrep.simxGetStringSignal(self._clientID, self.signals['gyro_signal'], self._operation_mode)
-            # gyro_data_unpacked_x = (struct.unpack("f", bytearray(gyro_data[1][:4]))[0] * 180) / math.pi
-            # gyro_data_unpacked_y = (struct.unpack("f", bytearray(gyro_data[1][4:8]))[0] * 180) / math.pi
-            # extract degrees per second
-            gyro_data_unpacked_z = (struct.unpack("f", bytearray(gyro_data[1][8:12]))[0] * 180) / math.pi
-            # self._term.write('-------------------------------------------------------\n'
-            #      '{} : X-Gyro = {} dps\n        Y-Gyro = {} dps\n        Z-Gyro = {} dps'
-            #      .format(self._port, round(gyro_data_unpacked_x, 2), round(gyro_data_unpacked_y, 2),
-            #              round(gyro_data_unpacked_z, 2)))
-
-            # add up
-            z += abs(gyro_data_unpacked_z)
-            # self._term.write('cumulative angle = {}'.format(z))
-        self._term.write('turn completed')
+            elapsed = clock() - start
+            if elapsed >= timeout:
+                self._term.write('turn timed out')
+                break
+            if cancel is not None and cancel.is_set():
+                self._term.write('turn cancelled')
+                break
+            if lockstep is not None:
+                # advance the simulation by one step, together with the other units
+                lockstep()
+            else:
+                next_tick += period
+                time.sleep(max(0.0, next_tick - time.perf_counter()))
+            # get the latest gyroscope reading, without waiting for the server unless the unit
+            # needs the reading of the step it just advanced
+            rate = self._read_gyro_rate(blocking=lockstep is not None)
+            reading = self._vrep.simxGetLastCmdTime(self._clientID)
+            if rate is not None and last_reading is not None and reading > last_reading:
+                # add up the degrees turned since the last reading
+                z += abs(rate * 180 / math.pi) * (reading - last_reading) / 1000.0
+            if rate is not None:
+                last_reading = reading
+
+        self.set_wheels_velocity(0, 0)
+        elapsed = clock() - start
+        self._term.write('turn completed: {:.1f} degrees in {:.2f}s'.format(z, elapsed))
+        return z, elapsed
 
     def go(self, speed):
         """
@@ -279,23 +616,104 @@ class World(object):
         :param speed: velocity of both wheels
         """
         self._term.write('going, speed = {}'.format(speed))
-        vrep.simxSetJointTargetVelocity(self._clientID, self.wheels_handles["wheel_right"], speed,
-                                        self._operation_mode)
-        vrep.simxSetJointTargetVelocity(self._clientID, self.wheels_handles["wheel_left"], speed,
-                                        self._operation_mode)
+        self.set_wheels_velocity(speed, speed)
+
+    def set_synchronous(self, enable):
+        """
+        enables or disables the synchronous mode for this connection: when enabled the
+        simulation only advances when step() is called
+        :param enable: true to enable the synchronous mode, false to disable it
+        """
+        self._vrep.simxSynchronous(self._clientID, enable)
+
+    def step(self):
+        """
+        advances the simulation by one step (synchronous mode only) and waits until the step
+        has been computed
+        :return: simulation time of the last command processed by the server
+        """
+        self._vrep.simxSynchronousTrigger(self._clientID)
+        # the ping returns only after the server processed the trigger, i.e. after the step
+        self._vrep.simxGetPingTime(self._clientID)
+        return self._vrep.simxGetLastCmdTime(self._clientID)
+
+    @contextlib.contextmanager
+    def command_batch(self):
+        """
+        context manager that groups the commands sent inside the block into a single message,
+        that vrep applies in the same simulation step.
+        The commands in the block must use a non-blocking operation mode (e.g. simx_opmode_oneshot).
+        The batches of different threads do not interleave: the block holds the command lock
+        """
+        with self._command_lock:
+            self._vrep.simxPauseCommunication(self._clientID, True)
+            try:
+                yield
+            finally:
+                self._vrep.simxPauseCommunication(self._clientID, False)
+
+    def set_wheels_velocity(self, speedr, speedl):
+        """
+        sets the target velocity of both wheels atomically, in a single message; the velocities
+        equal to the last ones sent are not sent again (see setpoint_refresh)
+        :param speedr: speed of the right wheel
+        :param speedl: speed of the left wheel
+        """
+        with self._command_lock:
+            if self.odometry is not None:
+                self.odometry.set_speeds(self._vrep.simxGetLastCmdTime(self._clientID) / 1000.0, speedr, speedl)
+
+            now = time.perf_counter()
+            changed = []
+            for wheel, speed in (("wheel_right", speedr), ("wheel_left", speedl)):
+                last = self._setpoints.get(wheel)
+                if last is not None and last[0] == speed and \
+                        (self._setpoint_refresh is None or now - last[1] < self._setpoint_refresh):
+                    self.suppressed_commands += 1
+                else:
+                    changed.append((wheel, speed))
+            if not changed:
+                return
+
+            with self.command_batch():
+                for wheel, speed in changed:
+                    self._vrep.simxSetJointTargetVelocity(self._clientID, self.wheels_handles[wheel], speed,
+                                                    self._vrep.simx_opmode_oneshot)
+                    self._setpoints[wheel] = (speed, now)
+
+    def set_resolution(self, resolution):
+        """
+        sets the resolution of the kinect depth and rgb sensors, in a single message
+        (the perception works on fractions of the frame, hence it does not depend on the resolution)
+        :param resolution: (x, y) resolution
+        """
+        resolution = tuple(resolution)
+        with self._command_lock:
+            if resolution == self._resolution:
+                return
+            self._term.write('kinect resolution: {}x{}'.format(*resolution))
+            with self.command_batch():
+                for sensor in ('kinect_depth', 'kinect_rgb'):
+                    self._vrep.simxSetObjectIntParameter(self._clientID, self.sensors_handles[sensor],
+                                                   self._vrep.sim_visionintparam_resolution_x, resolution[0],
+                                                   self._vrep.simx_opmode_oneshot)
+                    self._vrep.simxSetObjectIntParameter(self._clientID, self.sensors_handles[sensor],
+                                                   self._vrep.sim_visionintparam_resolution_y, resolution[1],
+                                                   self._vrep.simx_opmode_oneshot)
+            self._resolution = resolution
 
     def loadup(self):
         """
-        spawns a cube and moves it on top of the unit
+        spawns a cube, moves it on top of the unit and attaches it to the plate
         (simulating the loadup operation)
         """
         self.stop()
         self._term.write("loading up...")
         # invoke the spawnCube function defined in the vrep scene
         return_code, out_int, out_float, out_string, out_buffer = \
-            vrep.simxCallScriptFunction(self._clientID,
+            self._vrep.simxCallScriptFunction(self._clientID,
                                         "",
-                                        vrep.sim_scripttype_mainscript,
+                                        self._vrep.sim_scripttype_mainscript,
                                         "spawnCube",
                                         [],
                                         [],
@@ -305,21 +723,19 @@ class World(object):
         # retrieve the spawned cube handle
         self._cube_handle = out_int[0]
 
-        # retrieve the plate position
-        return_code, plate_position = vrep.simxGetObjectPosition(self._clientID,
-                                                                 self.plate_handle,
-                                                                 -1,
-                                                                 self._operation_mode)
-        # put the cube a little bit higher than the plate
-        final_position = plate_position
-        final_position[2] += 0.05
-
-        # mov the cube on top of the plate
-        vrep.simxSetObjectPosition(self._clientID,
-                                   self._cube_handle,
-                                   -1,
-                                   final_position,
-                                   self._operation_mode)
+        with self.command_batch():
+            # mov the cube on top of the plate: a little bit higher than its center
+            self._vrep.simxSetObjectPosition(self._clientID,
+                                       self._cube_handle,
+                                       self.plate_handle,
+                                       [0, 0, 0.05],
+                                       self._vrep.simx_opmode_oneshot)
+            # attach it to the plate, so that it moves with the unit
+            self._vrep.simxSetObjectParent(self._clientID,
+                                     self._cube_handle,
+                                     self.plate_handle,
+                                     True,
+                                     self._vrep.simx_opmode_oneshot)
 
         # change state
         self._load = "FULL"
@@ -333,52 +749,40 @@ class World(object):
         self.stop()
         self._term.write("unloading...")
 
-        # remove the cube
-        vrep.simxRemoveObject(self._clientID, self._cube_handle, self._operation_mode)
+        # remove the cube (and detach it from the plate)
+        self._vrep.simxRemoveObject(self._clientID, self._cube_handle, self._operation_mode)
         self._cube_handle = None
 
         self._term.write("unload completed.")
         self._load = "EMPTY"
         return
 
-    # noinspection PyBroadException
     def act(self, action):
         """
         translates abstracted actions to elementary actions
-        :param action: string resembling the action to perform
-        :return:
-        """
-        separator = None
-        try:
-            # if we have a simple action (without other parameters)
-            separator = action.index(':')
-        except Exception:
-            if action == 'stop':
-                self.stop()
-                return
-            if action == 'unload':
-                self.unload()
-                return
-            if action == 'loadup':
-                self.loadup()
-                return
-
-        # if we have a complex action: extract 'action' and 'value'
-        # (in this case the action is in this form: 'go:2')
-        value = int(action[separator+1:])
-        action = action[:separator]
+        :param action: Action to perform, or string resembling it (see parse_action); None keeps
+                       the running action (see Brain.think)
+        :return: with the motion executor, the MotionHandle of the action (the action is performed on
+                 the control thread and preempts the running one); otherwise see perform
+        """
+        if action is None:
+            return None
+        if isinstance(action, str):
+            action = parse_action(action)
+        if self.motion is not None:
+            return self.motion.submit(action)
+        return self.perform(action)
 
-        if action == 'go':
-            self.go(value)
-            return
-        
-        if action == 'right':
-            self.turn(0, self._turning_speed, value)
-            return
-        
-        if action == 'left':
-            self.turn(self._turning_speed, 0, value)
-            return
+    def perform(self, action, cancel=None):
+        """
+        performs an action, on the calling thread
+        :param action: Action to perform, or string resembling it (see parse_action)
+        :param cancel: threading.Event that interrupts the action when set (only the turns can be interrupted)
+        :return: for the turns, achieved angle and duration (see turn)
+        """
+        if isinstance(action, str):
+            action = parse_action(action)
+        return self._dispatch[action.kind](action.value, cancel)
 
 
 class Brain(object):
@@ -396,6 +800,8 @@ class Brain(object):
         """
         # depth threshold that is used to detect obstacles (empirically determined)
         self._depth_treshold = 0.17
+        # distance (m) within which the obstacles known by the occupancy grid are avoided
+        self._map_lookahead = 0.5
         self._world = world
         self._state = None
         # last depth value for which DALI has been called
@@ -426,13 +832,18 @@ class Brain(object):
         """
         thinks and decides what to do
         :param sensor_reading: result of the sense (description of the environment)
-        :return: an action
+        :return: an Action, None to let the action running on the motion executor finish
         """
+        motion = self._world.motion
+        if motion is not None and motion.busy() and sensor_reading['depth'] > self._depth_treshold:
+            # an action (e.g. a turn) is still running and nothing is near: do not preempt it, and
+            # compare the next states with the one it started from
+            return None
         self._state, changed = self.perception(sensor_reading)
         # the world is changed of if the unit is facing the wrong direction -> call DALI.
         if changed or self._no_dali_count > 5:
             # stop the unit while DALi is computing
-            self._world.act('stop')
+            self._world.act(Action(STOP))
             self._no_dali_count = 0
             action = self.decision()
             self._previous_action = action
@@ -450,7 +861,8 @@ class Brain(object):
         new_state = {'color': sensor_reading['vision'][0].lower(),
                      'position': sensor_reading['vision'][1].lower(),
                      'depth': sensor_reading['depth'],
-                     'load': sensor_reading['load'].lower()}  # we build the new_state.
+                     'load': sensor_reading['load'].lower(),
+                     'free': sensor_reading['free_direction']}  # we build the new_state.
 
         # this is the first iteration, init the state
         if self._state is None:
@@ -467,7 +879,7 @@ class Brain(object):
     def decision(self):
         """
         invoke the DALI agent to get an action
-        :return: a decision from DALI
+        :return: a decision from DALI, as an Action
         """
 
         # update the depth that DALI knoes
@@ -483,13 +895,15 @@ class Brain(object):
         vision = "vision({},{}).".format(self._state['color'], self._state['position'])
         depth = "depth({}).".format(depth)
         load = "load({}).".format(self._state['load'])
+        free = "free({}).".format(self._state['free'])
         name = "agentname('{}:').".format(str(self._port))
 
         # meta instructions
-        meta = ":- dynamic vision/2. :- dynamic depth/1. :- dynamic load/1. :- dynamic agentname/1."
+        meta = ":- dynamic vision/2. :- dynamic depth/1. :- dynamic load/1. :- dynamic free/1. " \
+               ":- dynamic agentname/1."
 
         # final message
-        message = "{} {} {} {} {}".format(meta, vision, depth, load, name)
+        message = "{} {} {} {} {} {}".format(meta, vision, depth, load, free, name)
 
         # publish the message to the proxy
         self._to_linda.publish("LINDAchannel", self._agent_name + ':' + message)
@@ -504,19 +918,27 @@ class Brain(object):
                 # if the action is not meant for me
                 if name != self._port:
                     continue
-                # otherwise extract the action
-                action = msg[separator+1:]
+                # otherwise extract the action (each different answer is parsed only once)
+                action = parse_action(msg[separator+1:])
                 self._term.write('received action: {}'.format(action))
                 return action
 
     def ground_decision(self):
         """
         ground decision performed without invoking DALI
-        :return: an action
+        :return: an Action
         """
         if self._state['depth'] <= self._depth_treshold:
             # the unit is near something, call DALI
             return self.decision()
+        if self._previous_action is not None and self._previous_action.kind == GO and \
+                self._world.known_obstacle(0, self._map_lookahead):
+            # the unit is heading to an obstacle it has already seen: turn toward a side known to be free
+            if not self._world.known_obstacle(math.radians(40), self._map_lookahead):
+                return Action(LEFT, 40)
+            if not self._world.known_obstacle(-math.radians(40), self._map_lookahead):
+                return Action(RIGHT, 40)
+            return self.decision()
         # if the state is not changed and I'm not colliding then repeat the previous action
         return self._previous_action
 
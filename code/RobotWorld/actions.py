@@ -0,0 +1,55 @@
+import functools
+
+# kinds of actions
+GO = 'go'
+LEFT = 'left'
+RIGHT = 'right'
+STOP = 'stop'
+LOADUP = 'loadup'
+UNLOAD = 'unload'
+KINDS = (GO, LEFT, RIGHT, STOP, LOADUP, UNLOAD)
+
+
+class Action(object):
+    """
+    action of a unit: its kind and, for go and the turns, its value (speed or angle).
+    Actions are shared by the parser cache, hence they must not be modified
+    """
+
+    __slots__ = ('kind', 'value')
+
+    def __init__(self, kind, value=None):
+        """
+        :param kind: kind of the action (one of KINDS)
+        :param value: speed of go, angle of the turns (degrees), None for the other actions
+        """
+        self.kind = kind
+        self.value = value
+
+    def __eq__(self, other):
+        return isinstance(other, Action) and self.kind == other.kind and self.value == other.value
+
+    def __hash__(self):
+        return hash((self.kind, self.value))
+
+    def __repr__(self):
+        return 'Action({!r}, {!r})'.format(self.kind, self.value)
+
+    def __str__(self):
+        """
+        :return: the action in the form used by DALI, e.g. 'go:3' or 'stop'
+        """
+        return self.kind if self.value is None else '{}:{}'.format(self.kind, self.value)
+
+
+@functools.lru_cache(maxsize=256)
+def parse_action(text):
+    """
+    parses an action string: DALI answers with a handful of different strings, each one is parsed only once
+    :param text: action in the form 'kind' or 'kind:value', e.g. 'stop' or 'left:20'
+    :return: the Action
+    """
+    kind, separator, value = text.partition(':')
+    if kind not in KINDS:
+        raise ValueError('unknown action: {}'.format(text))
+    return Action(kind, int(value) if separator else None)
@@ -0,0 +1,97 @@
+import asyncio
+import concurrent.futures
+import functools
+
+# number of threads of the executor shared by the AsyncWorld objects that do not get their own
+DEFAULT_WORKERS = 8
+
+_default_executor = None
+
+
+def default_executor():
+    """
+    :return: the bounded thread pool shared by default by all the AsyncWorld objects
+    """
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = concurrent.futures.ThreadPoolExecutor(max_workers=DEFAULT_WORKERS)
+    return _default_executor
+
+
+class AsyncWorld(object):
+    """
+    asyncio interface of a World: the blocking remote API calls run on a bounded thread pool
+    (ctypes releases the GIL while they wait for the simulator), so that many units can share
+    one event loop.
+    """
+
+    def __init__(self, world, executor=None, max_concurrency=1):
+        """
+        :param world: World object that performs the calls
+        :param executor: executor that runs the calls, by default a thread pool shared by all
+                         the AsyncWorld objects
+        :param max_concurrency: maximum number of calls of this unit running at the same time. With more
+                                than one, the unit can sense while it acts: its commands and odometry
+                                are serialized (see World.command_batch), but its perception state is
+                                not, so two senses of the same unit must never be awaited at once
+        """
+        self.world = world
+        self._executor = executor or default_executor()
+        self._max_concurrency = max_concurrency
+        # created on first use, inside the event loop
+        self._semaphore = None
+
+    async def _run(self, function, *args):
+        """
+        runs a blocking function on the executor, within the concurrency limit of the unit
+        :param function: function to run
+        :param args: arguments of the function
+        :return: result of the function
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(function, *args))
+
+    async def sense(self):
+        """
+        see World.sense
+        """
+        return await self._run(self.world.sense)
+
+    async def act(self, action):
+        """
+        see World.act
+        """
+        return await self._run(self.world.act, action)
+
+    async def go(self, speed):
+        """
+        see World.go
+        """
+        return await self._run(self.world.go, speed)
+
+    async def stop(self):
+        """
+        see World.stop
+        """
+        return await self._run(self.world.stop)
+
+    async def turn(self, speedr, speedl, angle):
+        """
+        see World.turn
+        """
+        return await self._run(self.world.turn, speedr, speedl, angle)
+
+    async def loadup(self):
+        """
+        see World.loadup
+        """
+        return await self._run(self.world.loadup)
+
+    async def unload(self):
+        """
+        see World.unload
+        """
+        return await self._run(self.world.unload)
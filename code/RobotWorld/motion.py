@@ -0,0 +1,137 @@
+import threading
+
+
+class MotionHandle(object):
+    """
+    handle of an action submitted to a MotionExecutor
+    """
+
+    def __init__(self, action):
+        """
+        :param action: Action to perform
+        """
+        self.action = action
+        # set to ask the running action to stop
+        self.cancel_event = threading.Event()
+        self._done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def cancel(self):
+        """
+        asks the action to stop: a turn stops (and stops the unit) within one control tick,
+        an action that has not started yet is skipped
+        """
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def done(self):
+        """
+        :return: true if the action completed, was cancelled or failed
+        """
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """
+        waits for the end of the action
+        :param timeout: maximum waiting time (s)
+        :return: result of the action (see World.act), None if it is still running
+        """
+        self._done.wait(timeout)
+        return self.result
+
+    def _finish(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self._done.set()
+
+
+class MotionExecutor(object):
+    """
+    performs the actions of a World on a dedicated control thread, so that the caller can keep
+    sensing and thinking while the unit moves. Every action preempts the one that is running
+    (a turn is cancelled within one control tick, and stops the unit before the next action starts),
+    except the same action submitted again while it is running, which keeps running.
+    The caller keeps sending its own commands (e.g. World.set_resolution) while the control thread
+    moves the unit: World.command_batch and Odometry serialize them
+    """
+
+    def __init__(self, world):
+        """
+        :param world: World object that performs the actions (see World.perform)
+        """
+        self._world = world
+        self._condition = threading.Condition()
+        self._pending = None
+        self._running = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, action):
+        """
+        :param action: Action to perform
+        :return: MotionHandle of the action
+        """
+        with self._condition:
+            # the same action is already waiting or running: keep it
+            current = self._pending or self._running
+            if current is not None and current.action == action and not current.cancelled and not current.done():
+                return current
+            running = self._running
+            if running is not None:
+                running.cancel()
+            if self._pending is not None:
+                self._pending.cancel()
+                self._pending._finish()
+            self._pending = MotionHandle(action)
+            self._condition.notify()
+            return self._pending
+
+    def busy(self):
+        """
+        :return: true if an action is running or waiting to run
+        """
+        with self._condition:
+            return any(handle is not None and not handle.done() for handle in (self._running, self._pending))
+
+    def cancel(self):
+        """
+        cancels the running and the pending actions
+        """
+        with self._condition:
+            for handle in (self._running, self._pending):
+                if handle is not None:
+                    handle.cancel()
+
+    def shutdown(self):
+        """
+        cancels the actions and stops the control thread
+        """
+        self.cancel()
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _run(self):
+        """
+        control thread: performs the submitted actions one at a time
+        """
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None or self._closed)
+                if self._closed:
+                    return
+                handle = self._running = self._pending
+                self._pending = None
+            if handle.cancelled:
+                handle._finish()
+                continue
+            try:
+                handle._finish(self._world.perform(handle.action, handle.cancel_event))
+            except Exception as e:
+                handle._finish(error=e)
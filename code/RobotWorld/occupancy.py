@@ -0,0 +1,158 @@
+import math
+import threading
+
+import numpy as np
+
+# kobuki geometry (m)
+WHEEL_RADIUS = 0.035
+WHEEL_BASE = 0.23
+
+# log-odds added to the cells where a ray ends (occupied) and to the cells it crosses (free),
+# and bounds of the log-odds, so that the map can change its mind about a cell
+LOG_ODDS_HIT = 0.85
+LOG_ODDS_MISS = -0.4
+LOG_ODDS_BOUND = 4.0
+# log-odds above which a cell is considered occupied
+OCCUPIED_THRESHOLD = 1.0
+
+
+class Odometry(object):
+    """
+    dead-reckoning pose of the unit, in the frame of its starting pose: the distance comes from the
+    commanded wheel velocities, the heading from the gyroscope when a reading is available and from
+    the commanded velocities otherwise.
+    The pose is advanced by the sensing thread and the velocities are set by the control thread,
+    hence every access holds a lock
+    """
+
+    def __init__(self):
+        self.x = 0.0
+        self.y = 0.0
+        self.heading = 0.0
+        # commanded velocities of the right and left wheels (rad/s)
+        self._speeds = (0.0, 0.0)
+        self._time = None
+        self._lock = threading.Lock()
+
+    def advance(self, now, gyro_rate=None):
+        """
+        integrates the pose up to the given time
+        :param now: time (s)
+        :param gyro_rate: angular rate around the z axis (rad/s) measured by the gyroscope, if available
+        """
+        with self._lock:
+            self._advance(now, gyro_rate)
+
+    def _advance(self, now, gyro_rate=None):
+        """
+        see advance (the caller holds the lock)
+        """
+        if self._time is not None and now > self._time:
+            dt = now - self._time
+            right, left = self._speeds
+            speed = (right + left) / 2 * WHEEL_RADIUS
+            if gyro_rate is None:
+                gyro_rate = (right - left) * WHEEL_RADIUS / WHEEL_BASE
+            # integrate along the arc (midpoint heading)
+            heading = self.heading + gyro_rate * dt / 2
+            self.x += speed * math.cos(heading) * dt
+            self.y += speed * math.sin(heading) * dt
+            self.heading = (self.heading + gyro_rate * dt + math.pi) % (2 * math.pi) - math.pi
+        if self._time is None or now > self._time:
+            self._time = now
+
+    def set_speeds(self, now, speedr, speedl):
+        """
+        records new commanded wheel velocities, after integrating the pose with the previous ones
+        :param now: time (s)
+        :param speedr: velocity of the right wheel (rad/s)
+        :param speedl: velocity of the left wheel (rad/s)
+        """
+        with self._lock:
+            self._advance(now)
+            self._speeds = (speedr, speedl)
+
+    @property
+    def pose(self):
+        """
+        :return: (x, y, heading)
+        """
+        with self._lock:
+            return self.x, self.y, self.heading
+
+
+class OccupancyGrid(object):
+    """
+    local 2D occupancy grid of log-odds, centered on the starting pose of the unit.
+    Each update traces one ray per sector of the depth profile, sampled once per cell and cut at
+    the maximum range, so its cost is bounded by sectors * max_range / resolution cells whatever the
+    size of the grid and of the frames
+    """
+
+    def __init__(self, size=8.0, resolution=0.05, max_range=3.0):
+        """
+        :param size: side of the square area covered by the grid (m)
+        :param resolution: side of a cell (m)
+        :param max_range: maximum length of the rays (m)
+        """
+        self.resolution = resolution
+        self.max_range = max_range
+        self._cells = int(math.ceil(size / resolution))
+        self.log_odds = np.zeros((self._cells, self._cells), dtype=np.float32)
+        # distances of the samples of a ray
+        self._steps = np.arange(resolution / 2, max_range, resolution)
+
+    def _to_cells(self, x, y):
+        """
+        :param x: x coordinates (m)
+        :param y: y coordinates (m)
+        :return: row and column of the cells and mask of the coordinates inside the grid
+        """
+        row = np.floor(y / self.resolution).astype(np.intp) + self._cells // 2
+        column = np.floor(x / self.resolution).astype(np.intp) + self._cells // 2
+        inside = (row >= 0) & (row < self._cells) & (column >= 0) & (column < self._cells)
+        return row, column, inside
+
+    def update(self, pose, angles, distances, hits):
+        """
+        integrates one depth profile into the grid
+        :param pose: (x, y, heading) of the unit
+        :param angles: angle of each ray, relative to the heading (rad, counterclockwise)
+        :param distances: distance measured along each ray (m)
+        :param hits: for each ray, true if it ends on an obstacle (false if nothing was seen within range)
+        """
+        x, y, heading = pose
+        angles = heading + np.asarray(angles)
+        distances = np.minimum(np.asarray(distances), self.max_range)
+        # (rays, samples) coordinates of the samples of all the rays
+        ray_x = x + np.outer(np.cos(angles), self._steps)
+        ray_y = y + np.outer(np.sin(angles), self._steps)
+        row, column, inside = self._to_cells(ray_x, ray_y)
+
+        # the cells before the end of a ray are free, the cell at the end is occupied
+        # (each cell is updated at most once, even if several rays cross it)
+        free = inside & (self._steps < distances[:, None] - self.resolution / 2)
+        free_cells = np.unique(row[free] * self._cells + column[free])
+        row, column, inside = self._to_cells(x + distances * np.cos(angles), y + distances * np.sin(angles))
+        occupied = inside & np.asarray(hits, dtype=bool)
+        occupied_cells = np.unique(row[occupied] * self._cells + column[occupied])
+
+        cells = self.log_odds.ravel()
+        cells[free_cells] += LOG_ODDS_MISS
+        cells[occupied_cells] += LOG_ODDS_HIT
+        updated = np.concatenate((free_cells, occupied_cells))
+        cells[updated] = np.clip(cells[updated], -LOG_ODDS_BOUND, LOG_ODDS_BOUND)
+
+    def blocked(self, pose, angle, distance):
+        """
+        tells whether the map knows of an obstacle in a direction
+        :param pose: (x, y, heading) of the unit
+        :param angle: direction relative to the heading (rad, counterclockwise)
+        :param distance: distance within which obstacles are looked for (m)
+        :return: true if an occupied cell lies within the distance in that direction
+        """
+        x, y, heading = pose
+        steps = self._steps[self._steps < distance]
+        row, column, inside = self._to_cells(x + steps * math.cos(heading + angle),
+                                             y + steps * math.sin(heading + angle))
+        return bool((self.log_odds[row[inside], column[inside]] > OCCUPIED_THRESHOLD).any())
@@ -0,0 +1,334 @@
+import json
+import zlib
+
+import numpy as np
+
+# default region of interest of the depth features, as fractions of the frame
+# (first column, last column, first row, last row): the central vertical slice
+# (columns 210-430 of a 640x480 frame), where the obstacles in front of the unit are
+DEFAULT_DEPTH_ROI = (210 / 640, 430 / 640, 0.0, 1.0)
+
+
+def roi_slices(shape, roi):
+    """
+    converts a region of interest into array slices
+    :param shape: (rows, columns) of the frame
+    :param roi: region of interest as fractions of the frame (first column, last column, first row, last row)
+    :return: slice of the rows, slice of the columns (never empty)
+    """
+    rows, columns = shape[:2]
+    x0, x1, y0, y1 = roi
+    col_start = min(int(x0 * columns), columns - 1)
+    row_start = min(int(y0 * rows), rows - 1)
+    col_stop = max(int(round(x1 * columns)), col_start + 1)
+    row_stop = max(int(round(y1 * rows)), row_start + 1)
+    return slice(row_start, row_stop), slice(col_start, col_stop)
+
+
+def min_depth(depth, roi=DEFAULT_DEPTH_ROI):
+    """
+    finds the nearest point of a region of the depth buffer
+    :param depth: (rows, columns) depth buffer
+    :param roi: region of interest as fractions of the frame (first column, last column, first row, last row)
+    :return: minimum depth in the region and its (row, column) pixel location in the frame
+    """
+    rows, columns = roi_slices(depth.shape, roi)
+    region = depth[rows, columns]
+    index = int(region.argmin())
+    row, column = divmod(index, region.shape[1])
+    return float(region[row, column]), (rows.start + row, columns.start + column)
+
+
+# number of vertical sectors of the depth profile
+DEPTH_SECTORS = 5
+
+
+def sector_bounds(columns, sectors=DEPTH_SECTORS):
+    """
+    :param columns: number of columns of the frame
+    :param sectors: number of sectors
+    :return: first column of each vertical sector of the frame, left to right
+    """
+    return np.arange(sectors) * columns // sectors
+
+
+def depth_profile(depth, roi=DEFAULT_DEPTH_ROI, sectors=DEPTH_SECTORS):
+    """
+    finds, in a single pass over the rows of the region of interest, the nearest point of the region
+    and the nearest point of each vertical sector of the whole width of the frame
+    :param depth: (rows, columns) depth buffer
+    :param roi: region of interest as fractions of the frame (first column, last column, first row, last row)
+    :param sectors: number of sectors of the profile
+    :return: minimum depth in the region, its (row, column) pixel location in the frame and array of
+             the minimum depth of each sector, left to right
+    """
+    rows, columns = roi_slices(depth.shape, roi)
+    band = depth[rows]
+    # nearest point of each column
+    column_depth = band.min(axis=0)
+    column = columns.start + int(column_depth[columns].argmin())
+    row = rows.start + int(band[:, column].argmin())
+    profile = np.minimum.reduceat(column_depth, sector_bounds(band.shape[1], sectors))
+    return float(column_depth[column]), (row, column), profile
+
+
+def free_direction(profile):
+    """
+    estimates the direction toward which the unit can avoid an obstacle
+    :param profile: minimum depth of each sector, left to right
+    :return: 'left' or 'right': the side whose nearest point is farther ('left' on ties)
+    """
+    half = len(profile) // 2
+    return 'right' if min(profile[-half:]) > min(profile[:half]) else 'left'
+
+
+# stride (in pixels, along both axes) of the sample of the frames used by frame_signature
+SIGNATURE_STRIDE = 8
+
+
+def frame_signature(buffers, stride=SIGNATURE_STRIDE):
+    """
+    computes a cheap signature of the frames of the sensors: the crc32 of a strided sample
+    of their pixels (one pixel out of stride x stride), enough to tell whether the unit and the
+    scene in front of it have moved
+    :param buffers: frames, as arrays whose first two axes are rows and columns
+    :param stride: stride of the sample along both axes
+    :return: signature of the frames
+    """
+    signature = 0
+    for buffer in buffers:
+        signature = zlib.crc32(np.ascontiguousarray(buffer[::stride, ::stride]), signature)
+    return signature
+
+
+# default band of rows in which the colors are looked for, as fractions of the frame height
+# (first row, last row): the rows around the middle of the image
+DEFAULT_COLOR_BAND = (0.45, 0.55)
+# minimum fraction of the band that a color must cover to be detected
+MIN_COLOR_FRACTION = 0.002
+
+# default target color classes: name, reference rgb and tolerance (maximum distance on each channel)
+DEFAULT_COLOR_CLASSES = [
+    {'name': 'RED', 'rgb': [200, 41, 41], 'tolerance': 60},
+    {'name': 'GREEN', 'rgb': [72, 233, 72], 'tolerance': 60},
+]
+# bits per channel of the color lookup table (5 bits: 32^3 entries)
+COLOR_TABLE_BITS = 5
+
+
+class ColorTable(object):
+    """
+    quantized rgb lookup table that maps every color to one of the target color classes:
+    it is computed once from the classes, then each frame is classified with a single
+    fancy-indexing operation whatever the number of classes
+    """
+
+    def __init__(self, classes=None, bits=COLOR_TABLE_BITS):
+        """
+        :param classes: list of target color classes, each a dictionary with a 'name', a reference
+                        'rgb' color and a 'tolerance' (maximum distance on each channel); or the path of
+                        a json file containing such a list. By default DEFAULT_COLOR_CLASSES
+        :param bits: bits per channel of the table
+        """
+        if classes is None:
+            classes = DEFAULT_COLOR_CLASSES
+        elif isinstance(classes, str):
+            with open(classes) as f:
+                classes = json.load(f)
+
+        self.classes = classes
+        # label 0 means no class
+        self.names = ['NONE'] + [c['name'].upper() for c in classes]
+        self._bits = bits
+        self._shift = 8 - bits
+
+        # center of each quantization cell, on each channel
+        levels = 1 << bits
+        centers = (np.arange(levels) << self._shift) + ((1 << self._shift) >> 1)
+        r, g, b = np.meshgrid(centers, centers, centers, indexing='ij')
+
+        table = np.zeros((levels, levels, levels), dtype=np.uint8)
+        best = np.full(table.shape, np.inf)
+        for label, c in enumerate(classes, 1):
+            cr, cg, cb = c['rgb']
+            distance = np.maximum(np.maximum(np.abs(r - cr), np.abs(g - cg)), np.abs(b - cb))
+            # the nearest class wins where the tolerances overlap
+            match = (distance <= c['tolerance']) & (distance < best)
+            table[match] = label
+            best[match] = distance[match]
+        self._table = table.ravel()
+
+    def classify(self, image):
+        """
+        :param image: (rows, columns, 3) uint8 image
+        :return: (rows, columns) uint8 array of the class labels (indexes of self.names)
+        """
+        quantized = image >> self._shift
+        index = (quantized[..., 0].astype(np.intp) << (2 * self._bits)) | \
+                (quantized[..., 1].astype(np.intp) << self._bits) | quantized[..., 2]
+        return self._table[index]
+
+
+def classify_colors(image, band=DEFAULT_COLOR_BAND, table=None):
+    """
+    classifies the pixels of a band of rows of an image into the target color classes
+    :param image: (rows, columns, 3) uint8 image
+    :param band: band of rows as fractions of the frame height (first row, last row)
+    :param table: ColorTable of the target classes, by default the red and green belts
+    :return: dictionary color -> (fraction of the band's pixels, (x, y) centroid as fractions of the frame),
+             for the colors found in the band
+    """
+    global _default_table
+    if table is None:
+        if _default_table is None:
+            _default_table = ColorTable()
+        table = _default_table
+
+    height, width = image.shape[:2]
+    rows, columns = roi_slices(image.shape, (0.0, 1.0, band[0], band[1]))
+    labels = table.classify(image[rows])
+
+    # pixel count and coordinate sums of every class at once
+    flat = labels.ravel()
+    classes = len(table.names)
+    counts = np.bincount(flat, minlength=classes)
+    xs = np.bincount(flat, weights=np.tile(np.arange(width), labels.shape[0]), minlength=classes)
+    ys = np.bincount(flat, weights=np.repeat(np.arange(rows.start, rows.stop), width), minlength=classes)
+
+    stats = {}
+    for label in np.flatnonzero(counts[1:]) + 1:
+        count = counts[label]
+        stats[table.names[label]] = (float(count) / flat.size, (float(xs[label] / count + 0.5) / width,
+                                                                float(ys[label] / count + 0.5) / height))
+    return stats
+
+
+_default_table = None
+
+
+# values of each blob of the blob detection packet of the vision sensor
+# (size, orientation, position and size of the bounding box, as fractions of the frame)
+BLOB_DTYPE = np.dtype([('size', np.float32), ('orientation', np.float32), ('x', np.float32), ('y', np.float32),
+                       ('w', np.float32), ('h', np.float32)])
+# blob selection strategies: the largest blob, the blob nearest to the center of the image
+# or the largest blob of the target color
+BLOB_SELECTIONS = ('largest', 'center', 'color')
+# minimum fraction of the bounding box of a blob that a color must cover to be the blob's color
+MIN_BLOB_COLOR_FRACTION = 0.3
+# number of sampled pixels per side of a bounding box when classifying the color of a blob
+BLOB_COLOR_SAMPLES = 32
+
+
+def parse_blobs(packet):
+    """
+    parses the blob detection packet of the vision sensor
+    :param packet: blob count, number of values per blob, then the values of each blob
+                   (only the blobs whose values are all in the packet are parsed)
+    :return: structured array of the blobs (see BLOB_DTYPE)
+    """
+    if len(packet) < 2 or int(packet[0]) == 0 or int(packet[1]) < len(BLOB_DTYPE):
+        return np.zeros(0, dtype=BLOB_DTYPE)
+    per_blob = int(packet[1])
+    count = min(int(packet[0]), (len(packet) - 2) // per_blob)
+    values = np.asarray(packet[2:2 + count * per_blob], dtype=np.float32).reshape(count, per_blob)
+    return np.ascontiguousarray(values[:, :len(BLOB_DTYPE)]).view(BLOB_DTYPE).ravel()
+
+
+def filter_blobs(blobs, min_size=0.0, min_w=0.0, min_h=0.0):
+    """
+    :param blobs: structured array of the blobs
+    :param min_size: minimum size of the blobs
+    :param min_w: minimum width of the blobs
+    :param min_h: minimum height of the blobs
+    :return: the blobs that are big enough
+    """
+    return blobs[(blobs['size'] >= min_size) & (blobs['w'] >= min_w) & (blobs['h'] >= min_h)]
+
+
+def blob_colors(blobs, image, table):
+    """
+    classifies the color of each blob: the color class that covers most of its bounding box
+    (sampled on a grid of about BLOB_COLOR_SAMPLES x BLOB_COLOR_SAMPLES pixels)
+    :param blobs: structured array of the blobs
+    :param image: (rows, columns, 3) uint8 image in which the blobs have been detected
+    :param table: ColorTable of the target classes
+    :return: list of the blob colors ('NONE' if no class covers enough of the bounding box)
+    """
+    colors = []
+    for blob in blobs:
+        box = (blob['x'] - blob['w'] / 2, blob['x'] + blob['w'] / 2,
+               blob['y'] - blob['h'] / 2, blob['y'] + blob['h'] / 2)
+        rows, columns = roi_slices(image.shape, np.clip(box, 0.0, 1.0))
+        # sample the bounding box
+        rows = slice(rows.start, rows.stop, max(1, (rows.stop - rows.start) // BLOB_COLOR_SAMPLES))
+        columns = slice(columns.start, columns.stop, max(1, (columns.stop - columns.start) // BLOB_COLOR_SAMPLES))
+        labels = table.classify(image[rows, columns]).ravel()
+        counts = np.bincount(labels, minlength=len(table.names))
+        label = int(counts[1:].argmax()) + 1
+        if counts[label] >= MIN_BLOB_COLOR_FRACTION * labels.size:
+            colors.append(table.names[label])
+        else:
+            colors.append('NONE')
+    return colors
+
+
+def select_blob(blobs, strategy='largest', colors=None, target=None):
+    """
+    selects one of the blobs
+    :param blobs: structured array of the blobs
+    :param strategy: 'largest', 'center' (nearest to the center of the image) or 'color'
+                     (the largest blob of the target color)
+    :param colors: colors of the blobs, see blob_colors (required by the 'color' strategy)
+    :param target: target color of the 'color' strategy, by default any of the color classes
+    :return: index of the selected blob, None if no blob matches
+    """
+    if len(blobs) == 0:
+        return None
+    if strategy == 'largest':
+        return int(blobs['size'].argmax())
+    if strategy == 'center':
+        return int((np.abs(blobs['x'] - 0.5) + np.abs(blobs['y'] - 0.5)).argmin())
+    if strategy == 'color':
+        colors = np.asarray(colors)
+        match = colors == target.upper() if target is not None else colors != 'NONE'
+        if not match.any():
+            return None
+        return int(np.where(match, blobs['size'], -np.inf).argmax())
+    raise ValueError('unknown blob selection strategy: {}'.format(strategy))
+
+
+# kinect resolutions used while wandering and when a belt is near or centered (the resolution of the scene)
+LOW_RESOLUTION = (160, 120)
+HIGH_RESOLUTION = (640, 480)
+
+
+class ResolutionPolicy(object):
+    """
+    chooses the resolution of the kinect from the last perception: low while the unit is wandering,
+    high when a belt is near or centered, where precise blob positions and depths are needed.
+    The resolution is lowered again only after some perceptions without a near or centered belt,
+    so that it does not flicker at the edge of the field of view
+    """
+
+    def __init__(self, low=LOW_RESOLUTION, high=HIGH_RESOLUTION, hold=5):
+        """
+        :param low: (x, y) resolution while wandering
+        :param high: (x, y) resolution when a belt is near or centered
+        :param hold: number of perceptions without a near or centered belt before the resolution is lowered
+        """
+        self.low = tuple(low)
+        self.high = tuple(high)
+        self._hold = hold
+        # perceptions since a belt was last near or centered, the policy starts at high resolution
+        self._since_target = 0
+
+    def __call__(self, perception):
+        """
+        :param perception: output of World.sense
+        :return: (x, y) resolution of the kinect for the next frames
+        """
+        if perception['vision'][0] != 'NONE' and perception['vision'][1] in ('NEAR', 'CENTER'):
+            self._since_target = 0
+        else:
+            self._since_target += 1
+        return self.high if self._since_target < self._hold else self.low
@@ -0,0 +1,209 @@
+import threading
+import time
+
+# seconds the acquisition stage waits before reading the sensors again when vrep has no new frame
+ACQUISITION_IDLE = 0.005
+
+
+class LatestSlot(object):
+    """
+    single-slot queue between two stages: put never blocks and replaces the item that has not
+    been taken yet, so that the next stage always gets the latest one (stale items are dropped)
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._item = None
+        self._full = False
+        self._closed = False
+        # number of items replaced before being taken
+        self.dropped = 0
+
+    def put(self, item):
+        """
+        :param item: item that replaces the current one
+        """
+        with self._condition:
+            if self._full:
+                self.dropped += 1
+            self._item = item
+            self._full = True
+            self._condition.notify()
+
+    def get(self):
+        """
+        waits for an item and takes it
+        :return: the latest item, None if the slot has been closed
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._full or self._closed)
+            if not self._full:
+                return None
+            item = self._item
+            self._item = None
+            self._full = False
+            return item
+
+    def close(self):
+        """
+        wakes up the stage waiting on the slot
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+class StageStats(object):
+    """
+    latency counters of a pipeline stage
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        """
+        :param seconds: latency of one run of the stage
+        """
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def __str__(self):
+        return '{} {:.1f}/{:.1f} ms'.format(self.name, self.mean * 1000, self.max * 1000)
+
+
+class Pipeline(object):
+    """
+    runs the sense/think/act cycle of a unit as a pipeline: the acquisition of the frames
+    (World.acquire), their perception (World.perceive) and the decision and action (Brain.think and
+    World.act) run on separate threads, so that the remote API round trips overlap the processing.
+    The stages are connected by single-slot queues that drop the stale frames: each stage always
+    works on the latest output of the previous one.
+    The perception stage sends commands too (World.set_resolution) and advances the odometry while
+    the action stage sends the wheel setpoints: World.command_batch and Odometry serialize them, so
+    that the batches of the two stages are never merged or split
+    """
+
+    def __init__(self, world, brain, terminal, report_interval=100):
+        """
+        :param world: World object of the unit
+        :param brain: Brain object of the unit
+        :param terminal: terminal object used for the reports
+        :param report_interval: number of cycles between two latency reports (None to disable them)
+        """
+        self._world = world
+        self._brain = brain
+        self._term = terminal
+        self._report_interval = report_interval
+        self._frames = LatestSlot()
+        self._perceptions = LatestSlot()
+        self._running = threading.Event()
+        self._error = None
+        self._threads = []
+        # latency of each stage (mean/max), and age of the frames when the action is decided
+        self.stats = {name: StageStats(name) for name in ('acquire', 'perceive', 'think', 'act', 'age')}
+
+    def _acquire_stage(self):
+        """
+        reads the sensors as fast as vrep produces new frames
+        """
+        last_timestamp = None
+        while self._running.is_set():
+            start = time.perf_counter()
+            frame = self._world.acquire(copy=True)
+            self.stats['acquire'].add(time.perf_counter() - start)
+            if frame['timestamp'] == last_timestamp:
+                time.sleep(ACQUISITION_IDLE)
+                continue
+            last_timestamp = frame['timestamp']
+            frame['acquired'] = start
+            self._frames.put(frame)
+
+    def _perceive_stage(self):
+        """
+        extracts the features of the latest frame
+        """
+        while self._running.is_set():
+            frame = self._frames.get()
+            if frame is None:
+                return
+            start = time.perf_counter()
+            perception = self._world.perceive(frame)
+            self.stats['perceive'].add(time.perf_counter() - start)
+            self._perceptions.put((frame['acquired'], perception))
+
+    def _run_stage(self, stage):
+        """
+        runs a stage, stopping the pipeline if it fails
+        :param stage: stage function
+        """
+        try:
+            stage()
+        except BaseException as e:
+            self._error = e
+            self.stop()
+
+    def start(self):
+        """
+        starts the acquisition and perception stages
+        """
+        self._running.set()
+        for stage in (self._acquire_stage, self._perceive_stage):
+            thread = threading.Thread(target=self._run_stage, args=(stage,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """
+        stops all the stages
+        """
+        self._running.clear()
+        self._frames.close()
+        self._perceptions.close()
+
+    def run(self):
+        """
+        runs the pipeline: the decision and action stage runs on the calling thread, until stop is called
+        or one of the stages fails (its exception is raised again here)
+        """
+        self.start()
+        cycles = 0
+        try:
+            while self._running.is_set():
+                item = self._perceptions.get()
+                if item is None:
+                    break
+                acquired, perception = item
+                start = time.perf_counter()
+                self.stats['age'].add(start - acquired)
+                action = self._brain.think(perception)
+                self.stats['think'].add(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                self._world.act(action)
+                self.stats['act'].add(time.perf_counter() - start)
+
+                cycles += 1
+                if self._report_interval and cycles % self._report_interval == 0:
+                    self._term.write(self.report())
+        finally:
+            self.stop()
+            for thread in self._threads:
+                thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def report(self):
+        """
+        :return: latency report of the stages (mean/max) and number of dropped frames
+        """
+        return 'pipeline: {}, dropped {} frames and {} perceptions'.format(
+            ', '.join(str(stats) for stats in self.stats.values()), self._frames.dropped, self._perceptions.dropped)
@@ -0,0 +1,56 @@
+"""
+Benchmark of the obstacle depth extraction on 640x480 depth buffers.
+
+Compares the original nested loop of World.get_depth over the depth list with the vectorized
+RobotWorld.perception.min_depth over the depth array, and with RobotWorld.perception.depth_profile,
+which also computes the per-sector profile in the same pass.
+
+usage: python benchmarks/bench_depth.py
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), '..'))
+from RobotWorld.perception import min_depth, depth_profile
+
+
+def legacy_get_depth(matrix):
+    """
+    original World.get_depth, over the depth buffer as a list
+    """
+    depth = 100
+    for i in range(210, 430):
+        for j in range(480):
+            if matrix[i*220+j] < depth:
+                depth = matrix[i*220+j]
+    return round(depth, 5)
+
+
+def measure(fn, arg):
+    """
+    :return: best seconds per call
+    """
+    timer = timeit.Timer(lambda: fn(arg))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def main():
+    depth = np.random.random_sample((480, 640)).astype(np.float32)
+    depth_list = depth.ravel().tolist()
+
+    legacy = measure(legacy_get_depth, depth_list)
+    vectorized = measure(min_depth, depth)
+    profile = measure(depth_profile, depth)
+    print('640x480 depth buffer')
+    print('legacy loop: {:10.3f} ms'.format(legacy * 1000))
+    print('vectorized:  {:10.3f} ms'.format(vectorized * 1000))
+    print('profile:     {:10.3f} ms'.format(profile * 1000))
+    print('speedup:     {:10.0f}x'.format(legacy / vectorized))
+
+
+if __name__ == '__main__':
+    main()
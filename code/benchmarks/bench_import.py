@@ -0,0 +1,78 @@
+"""
+Import-time benchmark of RobotWorld with the vrep backend.
+
+Compares the current import (numpy is imported by the helpers that need it, the remoteApi prototypes
+are bound and the library is loaded on the first remote API call) with the former eager import,
+reproduced by importing numpy and binding all the prototypes right after the import. Each measure
+runs in a fresh interpreter and excludes its startup. RobotWorld needs numpy for the perception,
+hence its import only saves the prototypes and the library.
+
+Binding the prototypes needs the native remoteApi library, which is not available on every
+platform (the repository only ships the macOS one): the 'prototypes only' cases reproduce the
+eager import without it, by building the CFUNCTYPE type of every prototype without looking up
+its symbol, so that both columns are measured everywhere.
+
+usage: python benchmarks/bench_import.py [runs]
+"""
+import os
+import subprocess
+import sys
+
+CODE_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')
+
+# builds the ctypes function type of every prototype, as the eager import did, without the library
+BUILD_PROTOTYPES = 'import numpy; import ctypes; [ctypes.CFUNCTYPE(*p._types) for p in list(vrep.__dict__.values()) ' \
+                   'if isinstance(p, vrep._Prototype)]'
+
+# name, setup (not timed), statement
+CASES = [
+    ('vrepConst', '', 'import vrepConst'),
+    ('vrep (lazy)', '', 'import vrep'),
+    ('vrep (eager, prototypes only)', '', 'import vrep; ' + BUILD_PROTOTYPES),
+    ('numpy only, after the import', 'import vrep', 'import numpy'),
+    ('prototypes only, after the imports', 'import vrep; import numpy', BUILD_PROTOTYPES),
+    ('RobotWorld + vrep (lazy)', '', 'import RobotWorld; vrep = RobotWorld.load_backend("vrep")'),
+    ('RobotWorld + vrep (eager, prototypes only)', '',
+     'import RobotWorld; vrep = RobotWorld.load_backend("vrep"); ' + BUILD_PROTOTYPES),
+    ('RobotWorld + vrep (eager)', '', 'import RobotWorld; import numpy; RobotWorld.load_backend("vrep")._bind_prototypes()'),
+]
+
+TEMPLATE = '''
+import time
+{}
+start = time.perf_counter()
+{}
+print(time.perf_counter() - start)
+'''
+
+
+def measure(setup, statement, runs):
+    """
+    best import time over several fresh interpreters
+    :param setup: statement run before the timer starts
+    :param statement: import statement
+    :param runs: number of interpreters
+    :return: seconds, or None if the statement failed
+    """
+    times = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', TEMPLATE.format(setup, statement)], cwd=CODE_DIR,
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True)
+        if result.returncode != 0:
+            return None
+        times.append(float(result.stdout.split()[-1]))
+    return min(times)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    for name, setup, statement in CASES:
+        seconds = measure(setup, statement, runs)
+        if seconds is None:
+            print('{:>42}: n/a (the remoteApi library could not be loaded)'.format(name))
+        else:
+            print('{:>42}: {:8.2f} ms'.format(name, seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Microbenchmark of the signal pack/unpack helpers of vrep.py.
+
+Compares the original loop-based implementations (byte concatenation and one struct.unpack per
+value), the current list-based helpers (simxPackFloats, simxUnpackFloats, ...) and the numpy
+helpers (simxPackFloatsArray, simxUnpackFloatsArray, ...) at 10, 1k and 1M elements.
+
+usage: python benchmarks/bench_pack.py
+"""
+import os
+import struct
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), '..'))
+import vrep
+
+SIZES = [10, 1000, 1000000]
+# the original packing is quadratic: above this size it is estimated from the largest measured run
+LEGACY_PACK_LIMIT = 100000
+
+
+def legacy_pack_floats(float_list):
+    """
+    original simxPackFloats (python 3 branch)
+    """
+    s = bytes()
+    for i in range(len(float_list)):
+        s = s + struct.pack('<f', float_list[i])
+    return bytearray(s)
+
+
+def legacy_unpack_floats(packed):
+    """
+    original simxUnpackFloats
+    """
+    b = []
+    for i in range(int(len(packed) / 4)):
+        b.append(struct.unpack('<f', packed[4 * i:4 * (i + 1)])[0])
+    return b
+
+
+def measure(fn, arg):
+    """
+    best time of a few runs, scaled so that small inputs are timed over many iterations
+    :param fn: function to time
+    :param arg: argument passed to the function
+    :return: seconds per call
+    """
+    timer = timeit.Timer(lambda: fn(arg))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def main():
+    print('{:>9} | {:>6} | {:>12} | {:>12} | {:>12} | {:>9}'
+          .format('elements', 'op', 'legacy', 'struct', 'numpy', 'speedup'))
+    for n in SIZES:
+        values = np.random.random_sample(n).astype(np.float32)
+        value_list = values.tolist()
+        packed = vrep.simxPackFloatsArray(values)
+
+        if n <= LEGACY_PACK_LIMIT:
+            legacy_pack = measure(legacy_pack_floats, value_list)
+            legacy_label = '{:10.6f}s'.format(legacy_pack)
+        else:
+            # time a single run at the limit and extrapolate quadratically
+            sample = value_list[:LEGACY_PACK_LIMIT]
+            legacy_pack = timeit.timeit(lambda: legacy_pack_floats(sample), number=1) * (n / LEGACY_PACK_LIMIT) ** 2
+            legacy_label = '~{:9.1f}s'.format(legacy_pack)
+        struct_pack = measure(vrep.simxPackFloats, value_list)
+        numpy_pack = measure(vrep.simxPackFloatsArray, values)
+        print('{:>9} | {:>6} | {:>12} | {:10.6f}s | {:10.6f}s | {:8.0f}x'
+              .format(n, 'pack', legacy_label, struct_pack, numpy_pack, legacy_pack / numpy_pack))
+
+        legacy_unpack = measure(legacy_unpack_floats, packed)
+        struct_unpack = measure(vrep.simxUnpackFloats, packed)
+        numpy_unpack = measure(vrep.simxUnpackFloatsArray, packed)
+        print('{:>9} | {:>6} | {:10.6f}s | {:10.6f}s | {:10.6f}s | {:8.0f}x'
+              .format(n, 'unpack', legacy_unpack, struct_unpack, numpy_unpack, legacy_unpack / numpy_unpack))
+
+        if n <= LEGACY_PACK_LIMIT:
+            # sanity check: all the implementations agree
+            assert legacy_pack_floats(value_list) == vrep.simxPackFloats(value_list) == packed
+        assert legacy_unpack_floats(packed) == vrep.simxUnpackFloats(packed) == \
+            vrep.simxUnpackFloatsArray(packed).tolist()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Compares the sequential sense/think/act cycle of Controller.job with RobotWorld.Pipeline, against
+the fake backend (see vrepFake) and a brain that always answers the same action after a fixed
+thinking time (no DALI).
+
+usage: python benchmarks/bench_pipeline.py [seconds] [latency in seconds] [thinking time in seconds]
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), '..'))
+import RobotWorld
+import vrepFake
+from bench_world import SENSORS, WHEELS, SIGNALS, PLATE, NullTerminal
+
+
+class FixedBrain(object):
+    """
+    brain that answers 'go:3' after the thinking time
+    """
+
+    def __init__(self, thinking):
+        self._thinking = thinking
+        self.cycles = 0
+
+    def think(self, sensor_reading):
+        time.sleep(self._thinking)
+        self.cycles += 1
+        return 'go:3'
+
+
+def sequential(world, brain, seconds):
+    """
+    :return: cycles per second of the sequential cycle
+    """
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        world.act(brain.think(world.sense()))
+    return brain.cycles / seconds
+
+
+def pipelined(world, brain, seconds):
+    """
+    :return: cycles per second of the pipeline, and the pipeline
+    """
+    pipeline = RobotWorld.Pipeline(world, brain, NullTerminal(), report_interval=None)
+    threading.Timer(seconds, pipeline.stop).start()
+    pipeline.run()
+    return brain.cycles / seconds, pipeline
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.005
+    thinking = float(sys.argv[3]) if len(sys.argv) > 3 else 0.01
+    vrepFake.configure(latency=latency)
+
+    world = RobotWorld.World(SENSORS, WHEELS, SIGNALS, PLATE, terminal=NullTerminal(), backend='fake')
+    print('latency {}s, thinking time {}s'.format(latency, thinking))
+    print('sequential: {:6.1f} cycles/s'.format(sequential(world, FixedBrain(thinking), seconds)))
+    rate, pipeline = pipelined(world, FixedBrain(thinking), seconds)
+    print('pipelined:  {:6.1f} cycles/s'.format(rate))
+    print(pipeline.report())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Profiles the perception and control paths of RobotWorld.World against the fake backend
+(see vrepFake), without V-REP.
+
+usage: python benchmarks/bench_world.py [cycles] [latency in seconds] [acquisition]
+       python -m cProfile -s cumtime benchmarks/bench_world.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), '..'))
+import RobotWorld
+import vrepFake
+
+SENSORS = {'gyro': 'gyro_link_visual', 'kinect_depth': 'kinect_depth', 'kinect_rgb': 'kinect_rgb'}
+WHEELS = {'wheel_right': 'wheel_right_joint', 'wheel_left': 'wheel_left_joint'}
+SIGNALS = {'gyro_signal': 'gyro_signal'}
+PLATE = 'plate_top_visual'
+
+
+class NullTerminal(object):
+    """
+    terminal that discards the log
+    """
+
+    def write(self, message):
+        pass
+
+
+def main():
+    cycles = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    acquisition = sys.argv[3] if len(sys.argv) > 3 else 'blocking'
+    vrepFake.configure(latency=latency)
+
+    world = RobotWorld.World(SENSORS, WHEELS, SIGNALS, PLATE, terminal=NullTerminal(),
+                             acquisition=acquisition, backend='fake')
+    world.act('go:3')
+
+    sense = 0.0
+    act = 0.0
+    for i in range(cycles):
+        start = time.perf_counter()
+        world.sense()
+        sense += time.perf_counter() - start
+
+        start = time.perf_counter()
+        world.act('go:3')
+        act += time.perf_counter() - start
+
+    print('{} cycles, latency {}s, {} acquisition'.format(cycles, latency, acquisition))
+    print('sense: {:8.3f} ms/cycle'.format(sense / cycles * 1000))
+    print('act:   {:8.3f} ms/cycle'.format(act / cycles * 1000))
+    print('unchanged frames: {} skipped, {} processed'.format(world.frame_hits, world.frame_misses))
+    print('unchanged wheel setpoints: {} suppressed'.format(world.suppressed_commands))
+
+
+if __name__ == '__main__':
+    main()
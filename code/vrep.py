@@ -33,133 +33,176 @@ import ctypes as ct
 from vrepConst import *
 import os
 
-# load library
+# numpy is only imported by the *Array helpers that need it, so that importing this module stays cheap
+
+# load library (on first use, see _load_library)
 libsimx = None
-try:
-    real_path = os.path.realpath(__file__)[:-8]
-    if platform.system() =='cli':
-        libsimx = ct.CDLL(real_path+"/remoteApi.dll")
-    elif platform.system() =='Windows':
-        libsimx = ct.CDLL(real_path+"/remoteApi.dll") 
-    elif platform.system() == 'Darwin':
-        libsimx = ct.CDLL(real_path+"/remoteApi.dylib")
-    else:
-        libsimx = ct.CDLL(real_path+"/remoteApi.so")
-except:
-    print ('----------------------------------------------------')
-    print ('The remoteApi library could not be loaded. Make sure')
-    print ('it is located in the same folder as "vrep.py", or')
-    print ('appropriately adjust the file "vrep.py"')
-    print ('----------------------------------------------------')
-    print ('')
+
+def _load_library():
+    '''
+    Loads the remoteApi library. It is only called when the first remote API function is
+    invoked, so that importing this module (e.g. for the constants or the pack/unpack helpers)
+    does not need the native library.
+    '''
+    global libsimx
+    if libsimx is not None:
+        return libsimx
+    try:
+        real_path = os.path.realpath(__file__)[:-8]
+        if platform.system() =='cli':
+            libsimx = ct.CDLL(real_path+"/remoteApi.dll")
+        elif platform.system() =='Windows':
+            libsimx = ct.CDLL(real_path+"/remoteApi.dll") 
+        elif platform.system() == 'Darwin':
+            libsimx = ct.CDLL(real_path+"/remoteApi.dylib")
+        else:
+            libsimx = ct.CDLL(real_path+"/remoteApi.so")
+    except OSError:
+        print ('----------------------------------------------------')
+        print ('The remoteApi library could not be loaded. Make sure')
+        print ('it is located in the same folder as "vrep.py", or')
+        print ('appropriately adjust the file "vrep.py"')
+        print ('----------------------------------------------------')
+        print ('')
+        raise
+    return libsimx
+
+class _Prototype(object):
+    '''
+    ctypes wrapper prototype of a remoteApi function. The ctypes function is created (and the
+    library loaded) on the first call, then it replaces the prototype in the module namespace
+    so that the following calls go straight to ctypes.
+    '''
+
+    def __init__(self, name, restype, *argtypes):
+        self._name = name
+        self._types = (restype,) + argtypes
+        self._function = None
+
+    def bind(self):
+        if self._function is None:
+            self._function = ct.CFUNCTYPE(*self._types)((self._name, _load_library()))
+            globals()['c_' + self._name[4:]] = self._function
+        return self._function
+
+    def __call__(self, *args):
+        return self.bind()(*args)
+
+def _bind_prototypes():
+    '''
+    Binds all the prototypes at once (what importing this module used to do)
+    '''
+    for prototype in list(globals().values()):
+        if isinstance(prototype, _Prototype):
+            prototype.bind()
 
 #ctypes wrapper prototypes 
-c_GetJointPosition          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetJointPosition", libsimx))
-c_SetJointPosition          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetJointPosition", libsimx))
-c_GetJointMatrix            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetJointMatrix", libsimx))
-c_SetSphericalJointMatrix   = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxSetSphericalJointMatrix", libsimx))
-c_SetJointTargetVelocity    = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetJointTargetVelocity", libsimx))
-c_SetJointTargetPosition    = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetJointTargetPosition", libsimx))
-c_GetJointForce             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetJointForce", libsimx))
-c_SetJointForce             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetJointForce", libsimx))
-c_ReadForceSensor           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.c_int32)(("simxReadForceSensor", libsimx))
-c_BreakForceSensor          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxBreakForceSensor", libsimx))
-c_ReadVisionSensor          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.POINTER(ct.c_float)), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32)(("simxReadVisionSensor", libsimx))
-c_GetObjectHandle           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetObjectHandle", libsimx))
-c_GetVisionSensorImage      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_byte)), ct.c_ubyte, ct.c_int32)(("simxGetVisionSensorImage", libsimx))
-c_SetVisionSensorImage      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_byte), ct.c_int32, ct.c_ubyte, ct.c_int32)(("simxSetVisionSensorImage", libsimx))
-c_GetVisionSensorDepthBuffer= ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)), ct.c_int32)(("simxGetVisionSensorDepthBuffer", libsimx))
-c_GetObjectChild            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetObjectChild", libsimx))
-c_GetObjectParent           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetObjectParent", libsimx))
-c_ReadProximitySensor       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_float), ct.c_int32)(("simxReadProximitySensor", libsimx))
-c_LoadModel                 = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.POINTER(ct.c_int32), ct.c_int32)(("simxLoadModel", libsimx))
-c_LoadUI                    = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32)(("simxLoadUI", libsimx))
-c_LoadScene                 =  ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.c_int32)(("simxLoadScene", libsimx))
-c_StartSimulation           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32)(("simxStartSimulation", libsimx))
-c_PauseSimulation           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32)(("simxPauseSimulation", libsimx))
-c_StopSimulation            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32)(("simxStopSimulation", libsimx))
-c_GetUIHandle               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetUIHandle", libsimx))
-c_GetUISlider               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetUISlider", libsimx))
-c_SetUISlider               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)(("simxSetUISlider", libsimx))
-c_GetUIEventButton          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetUIEventButton", libsimx))
-c_GetUIButtonProperty       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetUIButtonProperty", libsimx))
-c_SetUIButtonProperty       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)(("simxSetUIButtonProperty", libsimx))
-c_AddStatusbarMessage       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxAddStatusbarMessage", libsimx))
-c_AuxiliaryConsoleOpen      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.c_int32)(("simxAuxiliaryConsoleOpen", libsimx))
-c_AuxiliaryConsoleClose     = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxAuxiliaryConsoleClose", libsimx))
-c_AuxiliaryConsolePrint     = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxAuxiliaryConsolePrint", libsimx))
-c_AuxiliaryConsoleShow      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32)(("simxAuxiliaryConsoleShow", libsimx))
-c_GetObjectOrientation      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetObjectOrientation", libsimx))
-c_GetObjectPosition         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetObjectPosition", libsimx))
-c_SetObjectOrientation      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxSetObjectOrientation", libsimx))
-c_SetObjectPosition         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxSetObjectPosition", libsimx))
-c_SetObjectParent           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32)(("simxSetObjectParent", libsimx))
-c_SetUIButtonLabel          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32)(("simxSetUIButtonLabel", libsimx))
-c_GetLastErrors             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)(("simxGetLastErrors", libsimx))
-c_GetArrayParameter         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetArrayParameter", libsimx))
-c_SetArrayParameter         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxSetArrayParameter", libsimx))
-c_GetBooleanParameter       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.c_int32)(("simxGetBooleanParameter", libsimx))
-c_SetBooleanParameter       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32)(("simxSetBooleanParameter", libsimx))
-c_GetIntegerParameter       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetIntegerParameter", libsimx))
-c_SetIntegerParameter       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)(("simxSetIntegerParameter", libsimx))
-c_GetFloatingParameter      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetFloatingParameter", libsimx))
-c_SetFloatingParameter      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetFloatingParameter", libsimx))
-c_GetStringParameter        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)(("simxGetStringParameter", libsimx))
-c_GetCollisionHandle        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetCollisionHandle", libsimx))
-c_GetDistanceHandle         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetDistanceHandle", libsimx))
-c_GetCollectionHandle       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetCollectionHandle", libsimx))
-c_ReadCollision             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.c_int32)(("simxReadCollision", libsimx))
-c_ReadDistance              = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxReadDistance", libsimx))
-c_RemoveObject              = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxRemoveObject", libsimx))
-c_RemoveModel               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxRemoveModel", libsimx))
-c_RemoveUI                  = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxRemoveUI", libsimx))
-c_CloseScene                = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32)(("simxCloseScene", libsimx))
-c_GetObjects                = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32)(("simxGetObjects", libsimx))
-c_DisplayDialog             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.c_int32)(("simxDisplayDialog", libsimx))
-c_EndDialog                 = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxEndDialog", libsimx))
-c_GetDialogInput            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)(("simxGetDialogInput", libsimx))
-c_GetDialogResult           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetDialogResult", libsimx))
-c_CopyPasteObjects          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32, ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxCopyPasteObjects", libsimx))
-c_GetObjectSelection        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetObjectSelection", libsimx))
-c_SetObjectSelection        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32, ct.c_int32)(("simxSetObjectSelection", libsimx))
-c_ClearFloatSignal          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxClearFloatSignal", libsimx))
-c_ClearIntegerSignal        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxClearIntegerSignal", libsimx))
-c_ClearStringSignal         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxClearStringSignal", libsimx))
-c_GetFloatSignal            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_float), ct.c_int32)(("simxGetFloatSignal", libsimx))
-c_GetIntegerSignal          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetIntegerSignal", libsimx))
-c_GetStringSignal           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetStringSignal", libsimx))
-c_SetFloatSignal            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_float, ct.c_int32)(("simxSetFloatSignal", libsimx))
-c_SetIntegerSignal          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32)(("simxSetIntegerSignal", libsimx))
-c_SetStringSignal           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32)(("simxSetStringSignal", libsimx))
-c_AppendStringSignal        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32)(("simxAppendStringSignal", libsimx))
-c_WriteStringStream         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32)(("simxWriteStringStream", libsimx))
-c_GetObjectFloatParameter   = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetObjectFloatParameter", libsimx))
-c_SetObjectFloatParameter   = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetObjectFloatParameter", libsimx))
-c_GetObjectIntParameter     = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetObjectIntParameter", libsimx))
-c_SetObjectIntParameter     = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)(("simxSetObjectIntParameter", libsimx))
-c_GetModelProperty          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetModelProperty", libsimx))
-c_SetModelProperty          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)(("simxSetModelProperty", libsimx))
-c_Start                     = ct.CFUNCTYPE(ct.c_int32,ct.POINTER(ct.c_char), ct.c_int32, ct.c_ubyte, ct.c_ubyte, ct.c_int32, ct.c_int32)(("simxStart", libsimx))
-c_Finish                    = ct.CFUNCTYPE(None, ct.c_int32)(("simxFinish", libsimx))
-c_GetPingTime               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32))(("simxGetPingTime", libsimx))
-c_GetLastCmdTime            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32)(("simxGetLastCmdTime", libsimx))
-c_SynchronousTrigger        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32)(("simxSynchronousTrigger", libsimx))
-c_Synchronous               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_ubyte)(("simxSynchronous", libsimx))
-c_PauseCommunication        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_ubyte)(("simxPauseCommunication", libsimx))
-c_GetInMessageInfo          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32))(("simxGetInMessageInfo", libsimx))
-c_GetOutMessageInfo         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32))(("simxGetOutMessageInfo", libsimx))
-c_GetConnectionId           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32)(("simxGetConnectionId", libsimx))
-c_CreateBuffer              = ct.CFUNCTYPE(ct.POINTER(ct.c_ubyte), ct.c_int32)(("simxCreateBuffer", libsimx))
-c_ReleaseBuffer             = ct.CFUNCTYPE(None, ct.c_void_p)(("simxReleaseBuffer", libsimx))
-c_TransferFile              = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32)(("simxTransferFile", libsimx))
-c_EraseFile                 = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxEraseFile", libsimx))
-c_GetAndClearStringSignal   = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetAndClearStringSignal", libsimx))
-c_ReadStringStream          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxReadStringStream", libsimx))
-c_CreateDummy               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_float, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_int32), ct.c_int32)(("simxCreateDummy", libsimx))
-c_Query                     = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxQuery", libsimx))
-c_GetObjectGroupData        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)(("simxGetObjectGroupData", libsimx))
-c_GetObjectVelocity         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.c_int32)(("simxGetObjectVelocity", libsimx))
-c_CallScriptFunction        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_int32),ct.c_int32,ct.POINTER(ct.c_float),ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_ubyte),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_ubyte)),ct.c_int32)(("simxCallScriptFunction", libsimx))
+c_GetJointPosition          = _Prototype("simxGetJointPosition", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetJointPosition          = _Prototype("simxSetJointPosition", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)
+c_GetJointMatrix            = _Prototype("simxGetJointMatrix", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetSphericalJointMatrix   = _Prototype("simxSetSphericalJointMatrix", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetJointTargetVelocity    = _Prototype("simxSetJointTargetVelocity", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)
+c_SetJointTargetPosition    = _Prototype("simxSetJointTargetPosition", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)
+c_GetJointForce             = _Prototype("simxGetJointForce", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetJointForce             = _Prototype("simxSetJointForce", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)
+c_ReadForceSensor           = _Prototype("simxReadForceSensor", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.c_int32)
+c_BreakForceSensor          = _Prototype("simxBreakForceSensor", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)
+c_ReadVisionSensor          = _Prototype("simxReadVisionSensor", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.POINTER(ct.c_float)), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32)
+c_GetObjectHandle           = _Prototype("simxGetObjectHandle", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetVisionSensorImage      = _Prototype("simxGetVisionSensorImage", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_byte)), ct.c_ubyte, ct.c_int32)
+c_SetVisionSensorImage      = _Prototype("simxSetVisionSensorImage", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_byte), ct.c_int32, ct.c_ubyte, ct.c_int32)
+c_GetVisionSensorDepthBuffer= _Prototype("simxGetVisionSensorDepthBuffer", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)), ct.c_int32)
+c_GetObjectChild            = _Prototype("simxGetObjectChild", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetObjectParent           = _Prototype("simxGetObjectParent", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_ReadProximitySensor       = _Prototype("simxReadProximitySensor", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_float), ct.c_int32)
+c_LoadModel                 = _Prototype("simxLoadModel", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.POINTER(ct.c_int32), ct.c_int32)
+c_LoadUI                    = _Prototype("simxLoadUI", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32)
+c_LoadScene                 = _Prototype("simxLoadScene", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.c_int32)
+c_StartSimulation           = _Prototype("simxStartSimulation", ct.c_int32,ct.c_int32, ct.c_int32)
+c_PauseSimulation           = _Prototype("simxPauseSimulation", ct.c_int32,ct.c_int32, ct.c_int32)
+c_StopSimulation            = _Prototype("simxStopSimulation", ct.c_int32,ct.c_int32, ct.c_int32)
+c_GetUIHandle               = _Prototype("simxGetUIHandle", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetUISlider               = _Prototype("simxGetUISlider", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_SetUISlider               = _Prototype("simxSetUISlider", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)
+c_GetUIEventButton          = _Prototype("simxGetUIEventButton", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetUIButtonProperty       = _Prototype("simxGetUIButtonProperty", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_SetUIButtonProperty       = _Prototype("simxSetUIButtonProperty", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)
+c_AddStatusbarMessage       = _Prototype("simxAddStatusbarMessage", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)
+c_AuxiliaryConsoleOpen      = _Prototype("simxAuxiliaryConsoleOpen", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.c_int32)
+c_AuxiliaryConsoleClose     = _Prototype("simxAuxiliaryConsoleClose", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)
+c_AuxiliaryConsolePrint     = _Prototype("simxAuxiliaryConsolePrint", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)
+c_AuxiliaryConsoleShow      = _Prototype("simxAuxiliaryConsoleShow", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32)
+c_GetObjectOrientation      = _Prototype("simxGetObjectOrientation", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_GetObjectPosition         = _Prototype("simxGetObjectPosition", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetObjectOrientation      = _Prototype("simxSetObjectOrientation", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetObjectPosition         = _Prototype("simxSetObjectPosition", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetObjectParent           = _Prototype("simxSetObjectParent", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32)
+c_SetUIButtonLabel          = _Prototype("simxSetUIButtonLabel", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32)
+c_GetLastErrors             = _Prototype("simxGetLastErrors", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)
+c_GetArrayParameter         = _Prototype("simxGetArrayParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetArrayParameter         = _Prototype("simxSetArrayParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_GetBooleanParameter       = _Prototype("simxGetBooleanParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.c_int32)
+c_SetBooleanParameter       = _Prototype("simxSetBooleanParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32)
+c_GetIntegerParameter       = _Prototype("simxGetIntegerParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_SetIntegerParameter       = _Prototype("simxSetIntegerParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)
+c_GetFloatingParameter      = _Prototype("simxGetFloatingParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetFloatingParameter      = _Prototype("simxSetFloatingParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)
+c_GetStringParameter        = _Prototype("simxGetStringParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)
+c_GetCollisionHandle        = _Prototype("simxGetCollisionHandle", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetDistanceHandle         = _Prototype("simxGetDistanceHandle", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetCollectionHandle       = _Prototype("simxGetCollectionHandle", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)
+c_ReadCollision             = _Prototype("simxReadCollision", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.c_int32)
+c_ReadDistance              = _Prototype("simxReadDistance", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_RemoveObject              = _Prototype("simxRemoveObject", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)
+c_RemoveModel               = _Prototype("simxRemoveModel", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)
+c_RemoveUI                  = _Prototype("simxRemoveUI", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)
+c_CloseScene                = _Prototype("simxCloseScene", ct.c_int32,ct.c_int32, ct.c_int32)
+c_GetObjects                = _Prototype("simxGetObjects", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32)
+c_DisplayDialog             = _Prototype("simxDisplayDialog", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.c_int32)
+c_EndDialog                 = _Prototype("simxEndDialog", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)
+c_GetDialogInput            = _Prototype("simxGetDialogInput", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)
+c_GetDialogResult           = _Prototype("simxGetDialogResult", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_CopyPasteObjects          = _Prototype("simxCopyPasteObjects", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32, ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetObjectSelection        = _Prototype("simxGetObjectSelection", ct.c_int32,ct.c_int32, ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.c_int32)
+c_SetObjectSelection        = _Prototype("simxSetObjectSelection", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32, ct.c_int32)
+c_ClearFloatSignal          = _Prototype("simxClearFloatSignal", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)
+c_ClearIntegerSignal        = _Prototype("simxClearIntegerSignal", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)
+c_ClearStringSignal         = _Prototype("simxClearStringSignal", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)
+c_GetFloatSignal            = _Prototype("simxGetFloatSignal", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_float), ct.c_int32)
+c_GetIntegerSignal          = _Prototype("simxGetIntegerSignal", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetStringSignal           = _Prototype("simxGetStringSignal", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)
+c_SetFloatSignal            = _Prototype("simxSetFloatSignal", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_float, ct.c_int32)
+c_SetIntegerSignal          = _Prototype("simxSetIntegerSignal", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32)
+c_SetStringSignal           = _Prototype("simxSetStringSignal", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32)
+c_AppendStringSignal        = _Prototype("simxAppendStringSignal", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32)
+c_WriteStringStream         = _Prototype("simxWriteStringStream", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32)
+c_GetObjectFloatParameter   = _Prototype("simxGetObjectFloatParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetObjectFloatParameter   = _Prototype("simxSetObjectFloatParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)
+c_GetObjectIntParameter     = _Prototype("simxGetObjectIntParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_SetObjectIntParameter     = _Prototype("simxSetObjectIntParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)
+c_GetModelProperty          = _Prototype("simxGetModelProperty", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_SetModelProperty          = _Prototype("simxSetModelProperty", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)
+c_Start                     = _Prototype("simxStart", ct.c_int32,ct.POINTER(ct.c_char), ct.c_int32, ct.c_ubyte, ct.c_ubyte, ct.c_int32, ct.c_int32)
+c_Finish                    = _Prototype("simxFinish", None, ct.c_int32)
+c_GetPingTime               = _Prototype("simxGetPingTime", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32))
+c_GetLastCmdTime            = _Prototype("simxGetLastCmdTime", ct.c_int32,ct.c_int32)
+c_SynchronousTrigger        = _Prototype("simxSynchronousTrigger", ct.c_int32,ct.c_int32)
+c_Synchronous               = _Prototype("simxSynchronous", ct.c_int32,ct.c_int32, ct.c_ubyte)
+c_PauseCommunication        = _Prototype("simxPauseCommunication", ct.c_int32,ct.c_int32, ct.c_ubyte)
+c_GetInMessageInfo          = _Prototype("simxGetInMessageInfo", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32))
+c_GetOutMessageInfo         = _Prototype("simxGetOutMessageInfo", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32))
+c_GetConnectionId           = _Prototype("simxGetConnectionId", ct.c_int32,ct.c_int32)
+c_CreateBuffer              = _Prototype("simxCreateBuffer", ct.POINTER(ct.c_ubyte), ct.c_int32)
+c_ReleaseBuffer             = _Prototype("simxReleaseBuffer", None, ct.c_void_p)
+c_TransferFile              = _Prototype("simxTransferFile", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32)
+c_EraseFile                 = _Prototype("simxEraseFile", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)
+c_GetAndClearStringSignal   = _Prototype("simxGetAndClearStringSignal", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)
+c_ReadStringStream          = _Prototype("simxReadStringStream", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)
+c_CreateDummy               = _Prototype("simxCreateDummy", ct.c_int32,ct.c_int32, ct.c_float, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_int32), ct.c_int32)
+c_Query                     = _Prototype("simxQuery", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetObjectGroupData        = _Prototype("simxGetObjectGroupData", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)
+c_GetObjectVelocity         = _Prototype("simxGetObjectVelocity", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.c_int32)
+c_CallScriptFunction        = _Prototype("simxCallScriptFunction", ct.c_int32,ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_int32),ct.c_int32,ct.POINTER(ct.c_float),ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_ubyte),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_ubyte)),ct.c_int32)
 
 #API functions
 def simxGetJointPosition(clientID, jointHandle, operationMode):
@@ -308,6 +351,36 @@ def simxGetVisionSensorImage(clientID, sensorHandle, options, operationMode):
             reso.append(resolution[i])
     return ret, reso, image
 
+def simxGetVisionSensorImageArray(clientID, sensorHandle, options, operationMode, copy=False):
+    '''
+    Same as simxGetVisionSensorImage, but returns the image as a numpy uint8 array of shape
+    (resolution y, resolution x, 3) (or (y, x) for greyscale images) instead of a list.
+
+    By default the array is a read-only view over the remote API buffer: it is only valid until
+    the next call that retrieves an image from the same sensor. Pass copy=True to get an owned,
+    writable array.
+    '''
+
+    resolution = (ct.c_int*2)()
+    c_image  = ct.POINTER(ct.c_byte)()
+    bytesPerPixel = 3
+    if (options & 1) != 0:
+        bytesPerPixel = 1
+    ret = c_GetVisionSensorImage(clientID, sensorHandle, resolution, ct.byref(c_image), options, operationMode)
+
+    reso = []
+    image = None
+    if (ret == 0):
+        reso = [resolution[0], resolution[1]]
+        shape = (resolution[1], resolution[0], bytesPerPixel) if bytesPerPixel == 3 else (resolution[1], resolution[0])
+        import numpy as np
+        image = np.ctypeslib.as_array(ct.cast(c_image, ct.POINTER(ct.c_ubyte)), shape=shape)
+        if copy:
+            image = image.copy()
+        else:
+            image.flags.writeable = False
+    return ret, reso, image
+
 def simxSetVisionSensorImage(clientID, sensorHandle, image, options, operationMode):
     '''
     Please have a look at the function description/documentation in the V-REP user manual
@@ -333,6 +406,30 @@ def simxGetVisionSensorDepthBuffer(clientID, sensorHandle, operationMode):
             reso.append(resolution[i])
     return ret, reso, buffer
 
+def simxGetVisionSensorDepthBufferArray(clientID, sensorHandle, operationMode, copy=False):
+    '''
+    Same as simxGetVisionSensorDepthBuffer, but returns the depth buffer as a numpy float32 array
+    of shape (resolution y, resolution x) instead of a list.
+
+    By default the array is a read-only view over the remote API buffer: it is only valid until
+    the next call that retrieves a depth buffer from the same sensor. Pass copy=True to get an
+    owned, writable array (a single memcpy).
+    '''
+    c_buffer  = ct.POINTER(ct.c_float)()
+    resolution = (ct.c_int*2)()
+    ret = c_GetVisionSensorDepthBuffer(clientID, sensorHandle, resolution, ct.byref(c_buffer), operationMode)
+    reso = []
+    buffer = None
+    if (ret == 0):
+        reso = [resolution[0], resolution[1]]
+        import numpy as np
+        buffer = np.ctypeslib.as_array(c_buffer, shape=(resolution[1], resolution[0]))
+        if copy:
+            buffer = buffer.copy()
+        else:
+            buffer.flags.writeable = False
+    return ret, reso, buffer
+
 def simxGetObjectChild(clientID, parentObjectHandle, childIndex, operationMode):
     '''
     Please have a look at the function description/documentation in the V-REP user manual
@@ -960,8 +1057,7 @@ def simxGetStringSignal(clientID, signalName, operationMode):
 
     a = bytearray()
     if ret == 0:
-        for i in range(signalLength.value):
-            a.append(signalValue[i])
+        a = bytearray(ct.string_at(signalValue, signalLength.value))
     if sys.version_info[0] != 3:
         a=str(a)
 
@@ -980,8 +1076,7 @@ def simxGetAndClearStringSignal(clientID, signalName, operationMode):
 
     a = bytearray()
     if ret == 0:
-        for i in range(signalLength.value):
-            a.append(signalValue[i])
+        a = bytearray(ct.string_at(signalValue, signalLength.value))
     if sys.version_info[0] != 3:
         a=str(a)
 
@@ -1000,8 +1095,7 @@ def simxReadStringStream(clientID, signalName, operationMode):
 
     a = bytearray()
     if ret == 0:
-        for i in range(signalLength.value):
-            a.append(signalValue[i])
+        a = bytearray(ct.string_at(signalValue, signalLength.value))
     if sys.version_info[0] != 3:
         a=str(a)
 
@@ -1035,10 +1129,10 @@ def simxSetStringSignal(clientID, signalName, signalValue, operationMode):
         if type(signalName) is str:
             signalName=signalName.encode('utf-8')
         if type(signalValue) is bytearray:
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
         if type(signalValue) is str:
             signalValue=signalValue.encode('utf-8')
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
     else:
         if type(signalValue) is bytearray:
             sigV = (ct.c_ubyte*len(signalValue))(*signalValue)
@@ -1058,10 +1152,10 @@ def simxAppendStringSignal(clientID, signalName, signalValue, operationMode):
         if type(signalName) is str:
             signalName=signalName.encode('utf-8')
         if type(signalValue) is bytearray:
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
         if type(signalValue) is str:
             signalValue=signalValue.encode('utf-8')
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
     else:
         if type(signalValue) is bytearray:
             sigV = (ct.c_ubyte*len(signalValue))(*signalValue)
@@ -1081,10 +1175,10 @@ def simxWriteStringStream(clientID, signalName, signalValue, operationMode):
         if type(signalName) is str:
             signalName=signalName.encode('utf-8')
         if type(signalValue) is bytearray:
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
         if type(signalValue) is str:
             signalValue=signalValue.encode('utf-8')
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
     else:
         if type(signalValue) is bytearray:
             sigV = (ct.c_ubyte*len(signalValue))(*signalValue)
@@ -1269,10 +1363,10 @@ def simxQuery(clientID, signalName, signalValue, retSignalName, timeOutInMs):
         if type(retSignalName) is str:
             retSignalName=retSignalName.encode('utf-8')
         if type(signalValue) is bytearray:
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
         if type(signalValue) is str:
             signalValue=signalValue.encode('utf-8')
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
     else:
         if type(signalValue) is bytearray:
             sigV = (ct.c_ubyte*len(signalValue))(*signalValue)
@@ -1285,8 +1379,7 @@ def simxQuery(clientID, signalName, signalValue, retSignalName, timeOutInMs):
 
     a = bytearray()
     if ret == 0:
-        for i in range(retSignalLength.value):
-            a.append(retSignalValue[i])
+        a = bytearray(ct.string_at(retSignalValue, retSignalLength.value))
     if sys.version_info[0] != 3:
         a=str(a)
 
@@ -1348,10 +1441,10 @@ def simxCallScriptFunction(clientID, scriptDescription, options, functionName, i
         if type(functionName) is str:
             functionName=functionName.encode('utf-8')
         if type(inputBuffer) is bytearray:
-            inputBufferV  = (ct.c_ubyte*len(inputBuffer))(*inputBuffer)
+            inputBufferV  = (ct.c_ubyte*len(inputBuffer)).from_buffer_copy(inputBuffer)
         if type(inputBuffer) is str:
             inputBuffer=inputBuffer.encode('utf-8')
-            inputBufferV  = (ct.c_ubyte*len(inputBuffer))(*inputBuffer)
+            inputBufferV  = (ct.c_ubyte*len(inputBuffer)).from_buffer_copy(inputBuffer)
     else:
         if type(inputBuffer) is bytearray:
             inputBufferV = (ct.c_ubyte*len(inputBuffer))(*inputBuffer)
@@ -1360,9 +1453,17 @@ def simxCallScriptFunction(clientID, scriptDescription, options, functionName, i
             inputBufferV = (ct.c_ubyte*len(inputBuffer))(*inputBuffer)
     inputBufferV=ct.cast(inputBufferV,ct.POINTER(ct.c_ubyte)) # IronPython needs this
 
-    c_inInts  = (ct.c_int*len(inputInts))(*inputInts)
+    # the inputs can only be numpy arrays if numpy has already been imported
+    np = sys.modules.get('numpy')
+    if np is not None and isinstance(inputInts, np.ndarray):
+        c_inInts  = (ct.c_int*len(inputInts)).from_buffer_copy(np.ascontiguousarray(inputInts, dtype=np.int32))
+    else:
+        c_inInts  = (ct.c_int*len(inputInts))(*inputInts)
     c_inInts = ct.cast(c_inInts,ct.POINTER(ct.c_int)) # IronPython needs this
-    c_inFloats  = (ct.c_float*len(inputFloats))(*inputFloats)
+    if np is not None and isinstance(inputFloats, np.ndarray):
+        c_inFloats  = (ct.c_float*len(inputFloats)).from_buffer_copy(np.ascontiguousarray(inputFloats, dtype=np.float32))
+    else:
+        c_inFloats  = (ct.c_float*len(inputFloats))(*inputFloats)
     c_inFloats = ct.cast(c_inFloats,ct.POINTER(ct.c_float)) # IronPython needs this
 
     concatStr=''.encode('utf-8')
@@ -1391,10 +1492,8 @@ def simxCallScriptFunction(clientID, scriptDescription, options, functionName, i
     ret = c_CallScriptFunction(clientID,scriptDescription,options,functionName,len(inputInts),c_inInts,len(inputFloats),c_inFloats,len(inputStrings),c_inStrings,len(inputBuffer),inputBufferV,ct.byref(intDataC),ct.byref(intDataP),ct.byref(floatDataC),ct.byref(floatDataP),ct.byref(stringDataC),ct.byref(stringDataP),ct.byref(bufferS),ct.byref(bufferP),operationMode)
 
     if ret == 0:
-        for i in range(intDataC.value):
-            intDataOut.append(intDataP[i])
-        for i in range(floatDataC.value):
-            floatDataOut.append(floatDataP[i])
+        intDataOut = intDataP[:intDataC.value]
+        floatDataOut = floatDataP[:floatDataC.value]
         s = 0
         for i in range(stringDataC.value):
             a = bytearray()
@@ -1410,8 +1509,7 @@ def simxCallScriptFunction(clientID, scriptDescription, options, functionName, i
             else:
                 a=str(a)
             stringDataOut.append(a)
-        for i in range(bufferS.value):
-            bufferOut.append(bufferP[i])
+        bufferOut = bytearray(ct.string_at(bufferP, bufferS.value))
     if sys.version_info[0] != 3:
         bufferOut=str(bufferOut)
 
@@ -1436,48 +1534,74 @@ def simxPackInts(intList):
     '''
     Please have a look at the function description/documentation in the V-REP user manual
     '''
-    
+
+    s=struct.pack('<%di' % len(intList), *intList)
     if sys.version_info[0] == 3:
-        s=bytes()
-        for i in range(len(intList)):
-            s=s+struct.pack('<i',intList[i])
         s=bytearray(s)
-    else:
-        s=''
-        for i in range(len(intList)):
-            s+=struct.pack('<i',intList[i])
     return s
 
 def simxUnpackInts(intsPackedInString):
     '''
     Please have a look at the function description/documentation in the V-REP user manual
     '''
-    b=[]
-    for i in range(int(len(intsPackedInString)/4)):
-        b.append(struct.unpack('<i',intsPackedInString[4*i:4*(i+1)])[0])
-    return b
+    n=int(len(intsPackedInString)/4)
+    return list(struct.unpack('<%di' % n, bytes(intsPackedInString[:4*n])))
 
 def simxPackFloats(floatList):
     '''
     Please have a look at the function description/documentation in the V-REP user manual
     '''
 
+    s=struct.pack('<%df' % len(floatList), *floatList)
     if sys.version_info[0] == 3:
-        s=bytes()
-        for i in range(len(floatList)):
-            s=s+struct.pack('<f',floatList[i])
         s=bytearray(s)
-    else:
-        s=''
-        for i in range(len(floatList)):
-            s+=struct.pack('<f',floatList[i])
     return s
 
 def simxUnpackFloats(floatsPackedInString):
     '''
     Please have a look at the function description/documentation in the V-REP user manual
     '''
-    b=[]
-    for i in range(int(len(floatsPackedInString)/4)):
-        b.append(struct.unpack('<f',floatsPackedInString[4*i:4*(i+1)])[0])
-    return b
+    n=int(len(floatsPackedInString)/4)
+    return list(struct.unpack('<%df' % n, bytes(floatsPackedInString[:4*n])))
+
+def simxPackIntsArray(ints):
+    '''
+    Packs a sequence or numpy array of ints into a bytearray of little-endian int32 values,
+    in a single vectorized conversion (same output as simxPackInts).
+    '''
+
+    import numpy as np
+    return bytearray(np.asarray(ints, dtype='<i4').tobytes())
+
+def simxUnpackIntsArray(intsPackedInString):
+    '''
+    Unpacks a buffer of little-endian int32 values into a numpy int32 array, without copying:
+    the array is a read-only view over the given buffer (trailing bytes are ignored).
+    '''
+
+    n=len(intsPackedInString)//4
+    import numpy as np
+    array=np.frombuffer(intsPackedInString, dtype='<i4', count=n)
+    array.flags.writeable=False
+    return array
+
+def simxPackFloatsArray(floats):
+    '''
+    Packs a sequence or numpy array of floats into a bytearray of little-endian float32 values,
+    in a single vectorized conversion (same output as simxPackFloats).
+    '''
+
+    import numpy as np
+    return bytearray(np.asarray(floats, dtype='<f4').tobytes())
+
+def simxUnpackFloatsArray(floatsPackedInString):
+    '''
+    Unpacks a buffer of little-endian float32 values into a numpy float32 array, without copying:
+    the array is a read-only view over the given buffer (trailing bytes are ignored).
+    '''
+
+    n=len(floatsPackedInString)//4
+    import numpy as np
+    array=np.frombuffer(floatsPackedInString, dtype='<f4', count=n)
+    array.flags.writeable=False
+    return array
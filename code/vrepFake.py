@@ -0,0 +1,587 @@
+"""
+Loopback stand-in for the subset of the V-REP remote API (vrep.py) used by the project.
+
+It does not need V-REP nor the native remoteApi library: it simulates a simple scene (a square
+room with a red and a green conveyor belt on opposite walls) in which every unit is a
+differential-drive body, and it serves synthetic frames rendered from the pose of each unit,
+or frames read from a recording.
+
+Select it with the ROBOTWORLD_BACKEND=fake environment variable or with the backend='fake'
+argument of RobotWorld.World. It can be configured with configure() or with these environment
+variables:
+- VREP_FAKE_LATENCY: seconds added to every blocking call (default 0), to mimic the round trip
+- VREP_FAKE_RESOLUTION: resolution of the synthetic frames, e.g. '640x480' (default)
+- VREP_FAKE_RECORDING: path of a .npz recording (see save_recording) whose frames are served
+  in a loop instead of the synthetic ones
+
+Objects are created on demand: every name passed to simxGetObjectHandle gets a handle, and
+the name suffix ('#0', '#1', ...) identifies the unit the object belongs to, as in the scene.
+"""
+import math
+import os
+import threading
+import time
+
+import numpy as np
+
+from vrepConst import *
+# the pack/unpack helpers do not need the native library
+from vrep import simxPackInts, simxUnpackInts, simxPackFloats, simxUnpackFloats, \
+    simxPackIntsArray, simxUnpackIntsArray, simxPackFloatsArray, simxUnpackFloatsArray
+
+# seconds added to every blocking call
+_latency = float(os.environ.get('VREP_FAKE_LATENCY', 0))
+# (x, y) resolution of the synthetic frames
+_resolution = tuple(int(v) for v in os.environ.get('VREP_FAKE_RESOLUTION', '640x480').split('x'))
+# recorded frames: dictionary with the 'depth', 'image' and (optionally) 'blobs' arrays
+_recording = None
+
+# simulation time step (ms), used in synchronous mode and to pace the recorded frames
+STEP_MS = 50
+# objects that exist in the scene before any query (for each unit suffix)
+SCENE_OBJECTS = ['wheel_right_joint', 'wheel_left_joint', 'gyro_link_visual', 'kinect_depth', 'kinect_rgb',
+                 'plate_top_visual']
+SCENE_UNITS = ['', '#0', '#1', '#2']
+# kobuki geometry (m)
+WHEEL_RADIUS = 0.035
+WHEEL_BASE = 0.23
+# half size of the square room (m), the belts lie on the x = +ROOM and x = -ROOM walls
+ROOM = 2.5
+BELT_HALF_WIDTH = 0.5
+BELTS = [((ROOM, 0.0), (200, 41, 41)),      # red
+         ((-ROOM, 0.0), (72, 233, 72))]     # green
+# kinect field of view (rad) and clipping planes (m)
+FOV = math.radians(57)
+NEAR_CLIPPING = 0.01
+FAR_CLIPPING = 3.5
+
+
+def configure(latency=None, resolution=None, recording=None):
+    """
+    configures the fake backend
+    :param latency: seconds added to every blocking call
+    :param resolution: (x, y) resolution of the synthetic frames
+    :param recording: path of a .npz recording to serve instead of the synthetic frames
+    """
+    global _latency, _resolution, _recording
+    if latency is not None:
+        _latency = latency
+    if resolution is not None:
+        _resolution = tuple(resolution)
+    if recording is not None:
+        with np.load(recording) as data:
+            _recording = {key: data[key] for key in data.files}
+
+
+def save_recording(path, depths, images, blobs=None):
+    """
+    saves frames in the format read by VREP_FAKE_RECORDING
+    :param path: .npz file path
+    :param depths: (n, y, x) float32 depth buffers
+    :param images: (n, y, x, 3) uint8 images
+    :param blobs: (n, m) float32 blob packets as returned by simxReadVisionSensor, zero padded
+    """
+    arrays = {'depth': np.asarray(depths, dtype=np.float32), 'image': np.asarray(images, dtype=np.uint8)}
+    if blobs is not None:
+        arrays['blobs'] = np.asarray(blobs, dtype=np.float32)
+    np.savez_compressed(path, **arrays)
+
+
+if os.environ.get('VREP_FAKE_RECORDING'):
+    configure(recording=os.environ['VREP_FAKE_RECORDING'])
+
+
+class _Body(object):
+    """
+    a simulated unit: a differential-drive body integrated from its wheels' target velocities
+    """
+
+    def __init__(self, index):
+        # units start spread along the y axis, facing the red belt
+        self.x = 0.0
+        self.y = 0.8 * index
+        self.heading = 0.0
+        self.wheels = {'wheel_right': 0.0, 'wheel_left': 0.0}
+        self.omega = 0.0
+        self.updated_ms = 0
+        # last rendered frame, the depth and rgb sensors see the same scene at the same time
+        self._frame_key = None
+        self._frame = None
+
+    def advance(self, now_ms):
+        """
+        integrates the pose up to the given simulation time
+        :param now_ms: simulation time (ms)
+        """
+        dt = (now_ms - self.updated_ms) / 1000.0
+        self.updated_ms = now_ms
+        if dt <= 0:
+            return
+        right = self.wheels['wheel_right'] * WHEEL_RADIUS
+        left = self.wheels['wheel_left'] * WHEEL_RADIUS
+        speed = (right + left) / 2
+        self.omega = (right - left) / WHEEL_BASE
+        self.heading = (self.heading + self.omega * dt + math.pi) % (2 * math.pi) - math.pi
+        limit = ROOM - WHEEL_BASE
+        self.x = min(limit, max(-limit, self.x + speed * math.cos(self.heading) * dt))
+        self.y = min(limit, max(-limit, self.y + speed * math.sin(self.heading) * dt))
+
+    def render(self, resolution):
+        """
+        renders the kinect frames seen from the current pose
+        :param resolution: (x, y) resolution
+        :return: (y, x) float32 depth buffer, (y, x, 3) uint8 image and blob packet
+        """
+        if self._frame_key == (self.updated_ms, resolution):
+            return self._frame
+        width, height = resolution
+        # azimuth of each column, the leftmost column looks counterclockwise
+        azimuth = self.heading + (0.5 - (np.arange(width) + 0.5) / width) * FOV
+        dx = np.cos(azimuth)
+        dy = np.sin(azimuth)
+        # distance to the walls of the room along each column
+        with np.errstate(divide='ignore'):
+            tx = np.where(dx > 0, (ROOM - self.x) / dx, np.where(dx < 0, (-ROOM - self.x) / dx, np.inf))
+            ty = np.where(dy > 0, (ROOM - self.y) / dy, np.where(dy < 0, (-ROOM - self.y) / dy, np.inf))
+        distance = np.minimum(tx, ty)
+
+        colors = np.empty((width, 3), dtype=np.uint8)
+        colors[:] = 150
+        blobs = []
+        for (bx, by), color in BELTS:
+            hit_y = self.y + distance * dy
+            hit_x = self.x + distance * dx
+            on_belt = (np.abs(hit_x - bx) < 1e-6) & (np.abs(hit_y - by) < BELT_HALF_WIDTH)
+            if not on_belt.any():
+                continue
+            colors[on_belt] = color
+            columns = np.flatnonzero(on_belt)
+            belt_distance = float(distance[on_belt].min())
+            w = (columns[-1] - columns[0] + 1) / width
+            h = min(1.0, 0.5 / belt_distance)
+            blobs.append([float(w * h), 0.0, float(columns[0] + columns[-1] + 1) / 2 / width, 0.5, float(w), h])
+
+        # like vrep, the depth buffer holds the distance from the image plane, not along the ray
+        planar = distance * np.cos(azimuth - self.heading)
+        depth = np.clip((planar - NEAR_CLIPPING) / (FAR_CLIPPING - NEAR_CLIPPING), 0, 1).astype(np.float32)
+        depth = np.broadcast_to(depth, (height, width))
+        # floor in the lower half of the image, walls and belts in the upper half
+        image = np.empty((height, width, 3), dtype=np.uint8)
+        image[:height // 2] = 90
+        image[height // 2:] = colors
+        packet = [float(len(blobs)), 6.0] + [v for blob in blobs for v in blob]
+        self._frame_key = (self.updated_ms, resolution)
+        self._frame = depth, image, packet
+        return self._frame
+
+
+class _Scene(object):
+    """
+    state of the simulated scene, shared by all the clients
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.names = {}
+        self.objects = {}
+        self.positions = {}
+        self.bodies = {}
+        self.signals = {}
+        # parent of the objects attached to another object
+        self.parents = {}
+        # (x, y) resolution of the vision sensors whose resolution has been set
+        self.resolutions = {}
+        self.clients = {}
+        self.next_client = 0
+        # handles and cube names are never reused, even after the objects are removed (as in vrep)
+        self.next_handle = 1
+        self.next_cube = 0
+        self.synchronous = False
+        self.sync_time_ms = 0
+        self.start = time.time()
+        for suffix in SCENE_UNITS:
+            for name in SCENE_OBJECTS:
+                self.handle(name + suffix)
+
+    def now_ms(self):
+        """
+        :return: current simulation time (ms)
+        """
+        if self.synchronous:
+            return self.sync_time_ms
+        return int((time.time() - self.start) * 1000)
+
+    def handle(self, name):
+        """
+        :param name: object name
+        :return: handle of the object, created if needed
+        """
+        if name not in self.names:
+            handle = self.next_handle
+            self.next_handle += 1
+            self.names[name] = handle
+            self.objects[handle] = name
+        return self.names[name]
+
+    def body(self, name):
+        """
+        :param name: name of an object or signal of a unit
+        :return: the body of the unit the object belongs to
+        """
+        suffix = name[name.index('#'):] if '#' in name else ''
+        if suffix not in self.bodies:
+            self.bodies[suffix] = _Body(len(self.bodies))
+        body = self.bodies[suffix]
+        body.advance(self.now_ms())
+        return body
+
+    def frame(self, handle):
+        """
+        :param handle: handle of a vision sensor
+        :return: depth buffer, image and blob packet currently seen by the sensor
+        """
+        if _recording is not None:
+            index = (self.now_ms() // STEP_MS) % len(_recording['depth'])
+            blobs = _recording['blobs'][index].tolist() if 'blobs' in _recording else [0.0, 6.0]
+            return _recording['depth'][index], _recording['image'][index], blobs
+        return self.body(self.objects[handle]).render(self.resolutions.get(handle, _resolution))
+
+
+_scene = _Scene()
+
+
+def _call(clientID, operationMode, command=None):
+    """
+    simulates the communication of a command
+    :param clientID: client id
+    :param operationMode: operation mode of the command
+    :param command: key identifying the command, required for streamed commands
+    :return: return code
+    """
+    if clientID not in _scene.clients:
+        return simx_return_initialize_error_flag
+    streamed = _scene.clients[clientID]
+    mode = operationMode & 0xff0000
+    if mode == simx_opmode_blocking:
+        if _latency:
+            time.sleep(_latency)
+        return simx_return_ok
+    if mode == simx_opmode_streaming:
+        # the first reply is not available yet
+        new = command not in streamed
+        streamed.add(command)
+        return simx_return_novalue_flag if new else simx_return_ok
+    if mode == simx_opmode_buffer:
+        return simx_return_ok if command in streamed else simx_return_novalue_flag
+    if mode == simx_opmode_discontinue:
+        streamed.discard(command)
+    return simx_return_ok
+
+
+def simxStart(connectionAddress, connectionPort, waitUntilConnected, doNotReconnectOnceDisconnected, timeOutInMs,
+              commThreadCycleInMs):
+    with _scene.lock:
+        clientID = _scene.next_client
+        _scene.next_client += 1
+        _scene.clients[clientID] = set()
+        return clientID
+
+
+def simxFinish(clientID):
+    with _scene.lock:
+        if clientID == -1:
+            _scene.clients.clear()
+        else:
+            _scene.clients.pop(clientID, None)
+
+
+def simxGetPingTime(clientID):
+    ret = _call(clientID, simx_opmode_blocking)
+    return ret, int(_latency * 1000)
+
+
+def simxGetLastCmdTime(clientID):
+    return _scene.now_ms()
+
+
+def simxSynchronous(clientID, enable):
+    with _scene.lock:
+        if enable and not _scene.synchronous:
+            _scene.sync_time_ms = _scene.now_ms()
+        elif not enable and _scene.synchronous:
+            _scene.start = time.time() - _scene.sync_time_ms / 1000.0
+        _scene.synchronous = bool(enable)
+    return _call(clientID, simx_opmode_blocking)
+
+
+def simxSynchronousTrigger(clientID):
+    with _scene.lock:
+        _scene.sync_time_ms += STEP_MS
+    return _call(clientID, simx_opmode_oneshot)
+
+
+def simxPauseCommunication(clientID, enable):
+    # commands are applied immediately, hence they are always applied together
+    return 0
+
+
+def simxGetObjectHandle(clientID, objectName, operationMode):
+    if type(objectName) is bytes:
+        objectName = objectName.decode('utf-8')
+    with _scene.lock:
+        return _call(clientID, operationMode), _scene.handle(objectName)
+
+
+def simxGetObjectGroupData(clientID, objectType, dataType, operationMode):
+    with _scene.lock:
+        handles = list(_scene.objects)
+        names = [_scene.objects[h] for h in handles]
+    ret = _call(clientID, operationMode)
+    if dataType != 0:
+        # only the object names are supported
+        return simx_return_remote_error_flag, [], [], [], []
+    return ret, handles, [], [], names
+
+
+def simxGetIntegerParameter(clientID, paramIdentifier, operationMode):
+    return _call(clientID, operationMode), 0
+
+
+def simxGetObjectIntParameter(clientID, objectHandle, parameterID, operationMode):
+    with _scene.lock:
+        if objectHandle not in _scene.objects:
+            return simx_return_remote_error_flag, 0
+        resolution = _scene.resolutions.get(objectHandle, _resolution)
+    if parameterID == sim_visionintparam_resolution_x:
+        return _call(clientID, operationMode), resolution[0]
+    if parameterID == sim_visionintparam_resolution_y:
+        return _call(clientID, operationMode), resolution[1]
+    return simx_return_remote_error_flag, 0
+
+
+def simxSetObjectIntParameter(clientID, objectHandle, parameterID, parameterValue, operationMode):
+    with _scene.lock:
+        if objectHandle not in _scene.objects:
+            return simx_return_remote_error_flag
+        x, y = _scene.resolutions.get(objectHandle, _resolution)
+        if parameterID == sim_visionintparam_resolution_x:
+            _scene.resolutions[objectHandle] = (parameterValue, y)
+        elif parameterID == sim_visionintparam_resolution_y:
+            _scene.resolutions[objectHandle] = (x, parameterValue)
+        else:
+            return simx_return_remote_error_flag
+    return _call(clientID, operationMode)
+
+
+def simxGetObjectFloatParameter(clientID, objectHandle, parameterID, operationMode):
+    values = {sim_visionfloatparam_near_clipping: NEAR_CLIPPING, sim_visionfloatparam_far_clipping: FAR_CLIPPING,
+              sim_visionfloatparam_perspective_angle: FOV}
+    with _scene.lock:
+        if objectHandle not in _scene.objects or parameterID not in values:
+            return simx_return_remote_error_flag, 0.0
+    return _call(clientID, operationMode), values[parameterID]
+
+
+def simxGetVisionSensorImageArray(clientID, sensorHandle, options, operationMode, copy=False):
+    ret = _call(clientID, operationMode, ('image', sensorHandle))
+    if ret != simx_return_ok:
+        return ret, [], None
+    with _scene.lock:
+        depth, image, blobs = _scene.frame(sensorHandle)
+    if options & 1:
+        image = image.mean(axis=2).astype(np.uint8)
+    image = image.copy() if copy else image.view()
+    image.flags.writeable = copy
+    return ret, [image.shape[1], image.shape[0]], image
+
+
+def simxGetVisionSensorImage(clientID, sensorHandle, options, operationMode):
+    ret, resolution, image = simxGetVisionSensorImageArray(clientID, sensorHandle, options, operationMode)
+    return ret, resolution, [] if image is None else image.astype(np.int8).ravel().tolist()
+
+
+def simxGetVisionSensorDepthBufferArray(clientID, sensorHandle, operationMode, copy=False):
+    ret = _call(clientID, operationMode, ('depth', sensorHandle))
+    if ret != simx_return_ok:
+        return ret, [], None
+    with _scene.lock:
+        depth, image, blobs = _scene.frame(sensorHandle)
+    depth = depth.copy() if copy else depth.view()
+    depth.flags.writeable = copy
+    return ret, [depth.shape[1], depth.shape[0]], depth
+
+
+def simxGetVisionSensorDepthBuffer(clientID, sensorHandle, operationMode):
+    ret, resolution, depth = simxGetVisionSensorDepthBufferArray(clientID, sensorHandle, operationMode)
+    return ret, resolution, [] if depth is None else depth.ravel().tolist()
+
+
+def simxReadVisionSensor(clientID, sensorHandle, operationMode):
+    ret = _call(clientID, operationMode, ('read', sensorHandle))
+    if ret != simx_return_ok:
+        return ret, False, []
+    with _scene.lock:
+        depth, image, blobs = _scene.frame(sensorHandle)
+    # first packet: min, max and average of intensity, red, green, blue and depth
+    channels = [image.mean(axis=2), image[..., 0], image[..., 1], image[..., 2]]
+    packet = []
+    for values in channels:
+        packet += [float(values.min()) / 255, float(values.max()) / 255, float(values.mean()) / 255]
+    packet += [float(depth.min()), float(depth.max()), float(depth.mean())]
+    return ret, blobs[0] > 0, [packet, blobs]
+
+
+def simxSetJointTargetVelocity(clientID, jointHandle, targetVelocity, operationMode):
+    with _scene.lock:
+        name = _scene.objects.get(jointHandle)
+        if name is None:
+            return simx_return_remote_error_flag
+        body = _scene.body(name)
+        joint = name.split('#')[0].replace('_joint', '')
+        if joint in body.wheels:
+            body.wheels[joint] = targetVelocity
+    return _call(clientID, operationMode)
+
+
+def simxGetStringSignal(clientID, signalName, operationMode):
+    if type(signalName) is bytes:
+        signalName = signalName.decode('utf-8')
+    ret = _call(clientID, operationMode, ('signal', signalName))
+    with _scene.lock:
+        if signalName.startswith('gyro_signal'):
+            # the gyroscope publishes its angular rates (rad/s) as packed floats
+            return ret, simxPackFloats([0.0, 0.0, _scene.body(signalName).omega])
+        if signalName not in _scene.signals:
+            return simx_return_novalue_flag, bytearray()
+        return ret, bytearray(_scene.signals[signalName])
+
+
+def simxSetStringSignal(clientID, signalName, signalValue, operationMode):
+    if type(signalName) is bytes:
+        signalName = signalName.decode('utf-8')
+    if type(signalValue) is str:
+        signalValue = signalValue.encode('utf-8')
+    with _scene.lock:
+        _scene.signals[signalName] = bytes(signalValue)
+    return _call(clientID, operationMode)
+
+
+def simxGetObjectPosition(clientID, objectHandle, relativeToObjectHandle, operationMode):
+    with _scene.lock:
+        if objectHandle in _scene.positions:
+            position = list(_scene.positions[objectHandle])
+        elif objectHandle in _scene.objects:
+            body = _scene.body(_scene.objects[objectHandle])
+            position = [body.x, body.y, 0.4]
+        else:
+            return simx_return_remote_error_flag, [0.0, 0.0, 0.0]
+    return _call(clientID, operationMode), position
+
+
+def simxSetObjectPosition(clientID, objectHandle, relativeToObjectHandle, position, operationMode):
+    with _scene.lock:
+        if objectHandle not in _scene.objects:
+            return simx_return_remote_error_flag
+        _scene.positions[objectHandle] = list(position)
+    return _call(clientID, operationMode)
+
+
+def simxRemoveObject(clientID, objectHandle, operationMode):
+    with _scene.lock:
+        name = _scene.objects.pop(objectHandle, None)
+        if name is None:
+            return simx_return_remote_error_flag
+        del _scene.names[name]
+        _scene.positions.pop(objectHandle, None)
+        _scene.parents.pop(objectHandle, None)
+    return _call(clientID, operationMode)
+
+
+def simxSetObjectParent(clientID, objectHandle, parentObject, keepInPlace, operationMode):
+    with _scene.lock:
+        if objectHandle not in _scene.objects or (parentObject != -1 and parentObject not in _scene.objects):
+            return simx_return_remote_error_flag
+        if parentObject == -1:
+            _scene.parents.pop(objectHandle, None)
+        else:
+            _scene.parents[objectHandle] = parentObject
+    return _call(clientID, operationMode)
+
+
+def _roi_pixels(first, last, size):
+    """
+    same conversion as the roiPixels function of the scene
+    :return: first pixel and size of a range given as fractions of a frame side
+    """
+    start = min(int(math.floor(first * size)), size - 1)
+    stop = max(int(math.floor(last * size + 0.5)), start + 1)
+    return start, stop - start
+
+
+def _perception_summary(inputInts, inputFloats):
+    """
+    numpy version of the perceptionSummary function of the scene (scene/perception_summary_script.lua)
+    :return: output ints and floats of the function
+    """
+    with _scene.lock:
+        depth, image, blobs = _scene.frame(inputInts[0])
+    height, width = depth.shape
+
+    # nearest point of each column, over the rows of the depth region of interest
+    x0, w = _roi_pixels(inputFloats[0], inputFloats[1], width)
+    y0, h = _roi_pixels(inputFloats[2], inputFloats[3], height)
+    band = depth[y0:y0 + h]
+    column_rows = band.argmin(axis=0)
+    column_depth = band[column_rows, np.arange(width)]
+    # nearest point of the region of interest
+    depth_column = x0 + int(column_depth[x0:x0 + w].argmin())
+    depth_row = y0 + int(column_rows[depth_column])
+    # nearest point of each vertical sector
+    sectors = inputInts[2]
+    profile = np.minimum.reduceat(column_depth, np.arange(sectors) * width // sectors)
+
+    # classify the pixels of the color band: the nearest class within its tolerance
+    by, bh = _roi_pixels(inputFloats[4], inputFloats[5], height)
+    band = image[by:by + bh].astype(np.int16)
+    labels = np.zeros(band.shape[:2], dtype=np.intp)
+    best = np.full(band.shape[:2], np.inf)
+    classes = np.reshape(inputInts[3:], (-1, 4))
+    for label, (r, g, b, tolerance) in enumerate(classes, 1):
+        distance = np.abs(band - (r, g, b)).max(axis=2)
+        match = (distance <= tolerance) & (distance < best)
+        labels[match] = label
+        best[match] = distance[match]
+    counts = np.bincount(labels.ravel(), minlength=len(classes) + 1)
+    color, fraction, color_x, color_y = 0, 0.0, 0.0, 0.0
+    if counts[1:].any():
+        color = int(counts[1:].argmax()) + 1
+        rows, columns = np.nonzero(labels == color)
+        fraction = float(counts[color]) / labels.size
+        color_x = (float(columns.mean()) + 0.5) / width
+        color_y = (by + float(rows.mean()) + 0.5) / height
+
+    # first blob of the blob detection filter
+    blob_count, blob_size, blob_x, blob_y = 0, 0.0, 0.0, 0.0
+    if blobs[0] > 0:
+        blob_count, blob_size, blob_x, blob_y = int(blobs[0]), blobs[2], blobs[4], blobs[5]
+
+    return [color, blob_count, depth_row, depth_column], \
+           [float(column_depth[depth_column]), fraction, color_x, color_y, blob_size, blob_x, blob_y] + \
+           [float(v) for v in profile]
+
+
+def simxCallScriptFunction(clientID, scriptDescription, options, functionName, inputInts, inputFloats, inputStrings,
+                           inputBuffer, operationMode):
+    if type(functionName) is bytes:
+        functionName = functionName.decode('utf-8')
+    if functionName == 'spawnCube':
+        with _scene.lock:
+            handle = _scene.handle('Cuboid{}'.format(_scene.next_cube))
+            _scene.next_cube += 1
+        return _call(clientID, operationMode), [handle], [], [], bytearray()
+    if functionName == 'perceptionSummary':
+        ret = _call(clientID, operationMode)
+        out_ints, out_floats = _perception_summary(inputInts, inputFloats)
+        return ret, out_ints, out_floats, [], bytearray()
+    return simx_return_remote_error_flag, [], [], [], bytearray()
+
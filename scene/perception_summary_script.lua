@@ -0,0 +1,122 @@
+--[[
+    The following function was added in the main script of the scene, next to spawnCube:
+    it summarizes what the kinect of a unit sees (nearest obstacle, depth profile, belt color, first blob),
+    so that the unit does not have to receive the whole depth buffer and image at every cycle
+    (see the 'summary' acquisition mode of RobotWorld.World).
+--]]
+
+-- converts a range given as fractions of a frame side into its first pixel (0-based) and its size
+roiPixels=function(first,last,size)
+    local start=math.min(math.floor(first*size),size-1)
+    local stop=math.max(math.floor(last*size+0.5),start+1)
+    return start,stop-start
+end
+
+perceptionSummary=function(inInts,inFloats,inStrings,inBuffer)
+    -- inInts: kinect depth handle, kinect rgb handle, number of sectors of the depth profile,
+    --         then red, green, blue and tolerance of each color class
+    -- inFloats: depth region of interest (first column, last column, first row, last row) and
+    --           color band (first row, last row), as fractions of the frame
+    local depthHandle=inInts[1]
+    local rgbHandle=inInts[2]
+    local sectors=inInts[3]
+
+    -- nearest point of each column, over the rows of the depth region of interest
+    local res=sim.getVisionSensorResolution(depthHandle)
+    local x0,w=roiPixels(inFloats[1],inFloats[2],res[1])
+    local y0,h=roiPixels(inFloats[3],inFloats[4],res[2])
+    local depth=sim.getVisionSensorDepthBuffer(depthHandle,0,y0,res[1],h)
+    local columnDepth,columnRow={},{}
+    for c=1,res[1] do
+        columnDepth[c]=math.huge
+        columnRow[c]=0
+    end
+    for r=0,h-1 do
+        for c=1,res[1] do
+            local d=depth[r*res[1]+c]
+            if d<columnDepth[c] then
+                columnDepth[c]=d
+                columnRow[c]=r
+            end
+        end
+    end
+    -- nearest point of the region of interest
+    local minDepth=math.huge
+    local depthColumn=x0
+    for c=x0+1,x0+w do
+        if columnDepth[c]<minDepth then
+            minDepth=columnDepth[c]
+            depthColumn=c-1
+        end
+    end
+    local depthRow=y0+columnRow[depthColumn+1]
+    -- nearest point of each vertical sector, left to right
+    local profile={}
+    for s=0,sectors-1 do
+        local sectorDepth=math.huge
+        for c=math.floor(s*res[1]/sectors)+1,math.floor((s+1)*res[1]/sectors) do
+            sectorDepth=math.min(sectorDepth,columnDepth[c])
+        end
+        profile[s+1]=sectorDepth
+    end
+
+    -- classify the pixels of the color band: the nearest class within its tolerance (on each channel)
+    res=sim.getVisionSensorResolution(rgbHandle)
+    local by,bh=roiPixels(inFloats[5],inFloats[6],res[2])
+    local image=sim.getVisionSensorImage(rgbHandle,0,by,res[1],bh)
+    local classes=(#inInts-3)/4
+    local counts,sumX,sumY={},{},{}
+    for c=1,classes do
+        counts[c]=0
+        sumX[c]=0
+        sumY[c]=0
+    end
+    for p=0,res[1]*bh-1 do
+        local r=image[3*p+1]*255
+        local g=image[3*p+2]*255
+        local b=image[3*p+3]*255
+        local best=0
+        local bestDistance=math.huge
+        for c=1,classes do
+            local k=3+4*(c-1)
+            local d=math.max(math.abs(r-inInts[k+1]),math.abs(g-inInts[k+2]),math.abs(b-inInts[k+3]))
+            if d<=inInts[k+4] and d<bestDistance then
+                best=c
+                bestDistance=d
+            end
+        end
+        if best>0 then
+            counts[best]=counts[best]+1
+            sumX[best]=sumX[best]+p%res[1]
+            sumY[best]=sumY[best]+math.floor(p/res[1])
+        end
+    end
+    -- the class that covers most of the band
+    local color,fraction,colorX,colorY=0,0,0,0
+    for c=1,classes do
+        if counts[c]>0 and (color==0 or counts[c]>counts[color]) then
+            color=c
+        end
+    end
+    if color>0 then
+        fraction=counts[color]/(res[1]*bh)
+        colorX=(sumX[color]/counts[color]+0.5)/res[1]
+        colorY=(by+sumY[color]/counts[color]+0.5)/res[2]
+    end
+
+    -- first blob of the blob detection filter
+    local blobCount,blobSize,blobX,blobY=0,0,0,0
+    local result,packet,blobs=sim.readVisionSensor(rgbHandle)
+    if blobs and blobs[1]>0 then
+        blobCount=blobs[1]
+        blobSize=blobs[3]
+        blobX=blobs[5]
+        blobY=blobs[6]
+    end
+
+    local outFloats={minDepth,fraction,colorX,colorY,blobSize,blobX,blobY}
+    for s=1,sectors do
+        outFloats[7+s]=profile[s]
+    end
+    return {color,blobCount,depthRow,depthColumn},outFloats,{},''
+end
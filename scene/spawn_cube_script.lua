@@ -8,7 +8,9 @@ spawnCube=function(inInts,inFloats,inStrings,inBuffer)
 	-- inBuffer is a string
     
     -- Perform any type of operation here.
-    local handle = sim.createPureShape(0,8,{0.15,0.15,0.15},3,nil)
+    -- the cube is static (options bit 4): the unit attaches it to its plate, so it must not be
+    -- simulated by the physics engine on its own
+    local handle = sim.createPureShape(0,16,{0.15,0.15,0.15},3,nil)
 
 	-- Always return 3 tables and a string, e.g.:
 	return {handle},{},{},''